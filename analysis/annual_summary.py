@@ -1,7 +1,9 @@
 import streamlit as st
 import pandas as pd
-from src.shared_utils import setup_sidebar
-from src.plots import plot_annual_averages
+from src.shared_utils import setup_sidebar, load_climate_indices
+from src.plots import plot_annual_averages, plot_spi
+from src.indices import HEATING_BASE, COOLING_BASE, WET_DAY_MM, SPI_MONTHS
+from src.aggregates import annual_summary, ANNUAL_LABELS, HEAVY_RAIN_MM
 
 st.title("📊 Annual Climate Summary")
 st.markdown("Comprehensive annual analysis of temperature and precipitation trends")
@@ -17,21 +19,36 @@ plot_annual_averages(filtered_df)
 st.markdown("### 📈 Year-over-Year Analysis")
 
 # Calculate annual statistics
-annual_stats = filtered_df.groupby("year").agg({
-    "temperature_avg": ["mean", "std"],
-    "temperature_2m_max": "max",
-    "temperature_2m_min": "min",
-    "precipitation_sum": ["sum", "mean", "max"]
-}).round(2)
-
-# Flatten column names
-annual_stats.columns = [
-    'Avg Temp (°C)', 'Temp Std Dev', 'Max Temp (°C)', 
-    'Min Temp (°C)', 'Total Rain (mm)', 'Daily Rain Avg (mm)', 'Max Daily Rain (mm)'
-]
+annual_stats = annual_summary(filtered_df).rename(columns=ANNUAL_LABELS)
 
 st.dataframe(annual_stats, use_container_width=True)
 
+# Climate indices
+st.markdown("### 🧮 Climate Indices")
+
+annual_index, spi = load_climate_indices()
+range_index = annual_index.loc[year_range[0]:year_range[1]]
+range_spi = spi[(spi['year'] >= year_range[0]) & (spi['year'] <= year_range[1])]
+
+if len(range_index) > 0:
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Heating Degree Days", f"{range_index['heating_degree_days'].mean():.0f}", delta="per year", delta_color="off", help=f"Base {HEATING_BASE:.0f}°C")
+    col2.metric("Cooling Degree Days", f"{range_index['cooling_degree_days'].mean():.0f}", delta="per year", delta_color="off", help=f"Base {COOLING_BASE:.0f}°C")
+    col3.metric("Longest Dry Spell", f"{range_index['longest_dry_spell'].max()} days", help=f"Consecutive days below {WET_DAY_MM:.0f}mm")
+    col4.metric("Longest Wet Spell", f"{range_index['longest_wet_spell'].max()} days", help=f"Consecutive days with at least {WET_DAY_MM:.0f}mm")
+    
+    st.dataframe(
+        range_index.rename(columns={
+            'heating_degree_days': 'Heating Degree Days',
+            'cooling_degree_days': 'Cooling Degree Days',
+            'longest_dry_spell': 'Longest Dry Spell (days)',
+            'longest_wet_spell': 'Longest Wet Spell (days)'
+        }),
+        use_container_width=True
+    )
+    
+    plot_spi(range_spi, SPI_MONTHS)
+
 # Climate trends analysis
 if len(annual_stats) >= 2:
     st.markdown("### 🔍 Climate Trends Analysis")
@@ -117,12 +134,12 @@ with col2:
         delta=f"{wettest_day['time']}"
     )
     
-    # Count of heavy rain days (>15mm)
-    heavy_rain_days = len(filtered_df[filtered_df['precipitation_sum'] > 15])
+    # Count of heavy rain days
+    heavy_rain_days = len(filtered_df[filtered_df['precipitation_sum'] > HEAVY_RAIN_MM])
     st.metric(
         "Heavy Rain Days", 
         f"{heavy_rain_days}",
-        delta="(>15mm/day)"
+        delta=f"(>{HEAVY_RAIN_MM}mm/day)"
     )
 
 with col3:
@@ -0,0 +1,75 @@
+import streamlit as st
+import numpy as np
+from src.shared_utils import year_range_slider, load_station_cube
+from src.stations import compare_stations
+from src.changepoints import batch_changepoints
+from src.plots import plot_station_small_multiples, plot_station_year_heatmap
+
+st.title("🗺️ Station Comparison")
+st.markdown("Rank and compare climate statistics across all monitoring stations")
+
+# Years covered by any station, not only the default station's archive
+cube = load_station_cube()
+year_range = year_range_slider(int(cube['years'].min()), int(cube['years'].max()))
+
+comparison = compare_stations(cube, year_range)
+
+# Step changes in every station's annual mean temperature, segmented in one batch
+selected_years = (cube['years'] >= year_range[0]) & (cube['years'] <= year_range[1])
+comparison['Temp Regime Shifts'] = [len(shifts) for shifts in batch_changepoints(cube['temp_mean'][:, selected_years])]
+
+st.markdown(f"Comparing **{len(comparison)}** station(s) for years {year_range[0]} - {year_range[1]}")
+
+if len(comparison) < 2:
+    st.info("ℹ️ Only one station is available. Add more `<station>_climate_data.csv` files to the data folder to compare sites.")
+
+# Ranking
+st.markdown("### 🏆 Station Rankings")
+
+col1, col2 = st.columns([2, 1])
+
+with col1:
+    rank_by = st.selectbox("Rank stations by", list(comparison.columns))
+
+with col2:
+    descending = st.toggle("Highest first", value=True)
+
+ranked = comparison.sort_values(rank_by, ascending=not descending)
+ranked.insert(0, 'Rank', np.arange(1, len(ranked) + 1))
+
+st.dataframe(ranked.round(3), use_container_width=True, height=400)
+
+# Annual series per station
+st.markdown("### 📈 Annual Series")
+
+series_metrics = {
+    'Avg Temp (°C)': 'temp_mean',
+    'Total Rain (mm)': 'rain_total',
+    'Max Temp (°C)': 'temp_max',
+    'Min Temp (°C)': 'temp_min',
+    'Max Daily Rain (mm)': 'rain_max',
+}
+
+col1, col2 = st.columns([2, 1])
+
+with col1:
+    series_label = st.selectbox("Annual statistic", list(series_metrics))
+
+with col2:
+    panel_count = st.slider(
+        "Stations to plot",
+        min_value=1,
+        max_value=min(len(comparison), 48),
+        value=min(len(comparison), 12),
+        help="Top stations from the ranking above"
+    ) if len(comparison) > 1 else 1
+
+# Small multiples for the top-ranked stations, in ranking order
+station_positions = {label: i for i, label in enumerate(comparison.index)}
+top_stations = [station_positions[label] for label in ranked.index[:panel_count]]
+
+plot_station_small_multiples(cube, top_stations, year_range, series_metrics[series_label], series_label)
+
+# Every station at once in a single trace
+with st.expander("View All Stations as Heatmap"):
+    plot_station_year_heatmap(cube, year_range, series_metrics[series_label], series_label)
@@ -3,10 +3,14 @@ import pandas as pd
 import numpy as np
 from sklearn.linear_model import LinearRegression
 from sklearn.metrics import r2_score
-import plotly.graph_objects as go
 import plotly.express as px
-from plotly.subplots import make_subplots
-from src.shared_utils import setup_sidebar
+from src.shared_utils import setup_sidebar, load_harmonic_design
+from src.harmonics import seasonal_harmonic_model
+from src.changepoints import detect_segments, monthly_anomalies
+from src.plots import plot_harmonic_decomposition, forecast_figure
+from src.aggregates import yearly_series
+from src.tables import paginated_table
+from src.forecast import prediction_intervals
 
 st.title("📈 Climate Trend Analysis & Forecasting")
 st.markdown("Explore historical trends and projected climate changes for Bergen, Norway")
@@ -22,12 +26,7 @@ if len(df) < 365:  # Less than a year of data
     st.warning("⚠️ Limited data available. For more accurate trend analysis, consider expanding the year range.")
 
 # Group by year for trend analysis
-yearly = df.groupby(df['time'].dt.year).agg({
-    'temperature_avg': 'mean',
-    'temperature_2m_max': 'max',
-    'temperature_2m_min': 'min', 
-    'precipitation_sum': 'sum'
-}).reset_index().rename(columns={'time': 'year'})
+yearly = yearly_series(df)
 
 # Check if we have multiple years for trend analysis
 if len(yearly) < 2:
@@ -37,12 +36,27 @@ if len(yearly) < 2:
 # Historical Trends Section
 st.markdown("## 📊 Historical Climate Trends")
 
+model_mode = st.radio(
+    "Trend model",
+    ["Annual means", "Daily seasonal harmonics"],
+    horizontal=True,
+    help="Fit a line to annual means, or fit trend plus annual and semiannual cycles to every daily value"
+)
+
+if model_mode == "Daily seasonal harmonics":
+    # Slice the precomputed design matrix to the selected rows and fit all variables at once
+    harmonic_model = seasonal_harmonic_model(load_harmonic_design()[df.index.to_numpy()], df)
+
 col1, col2 = st.columns(2)
 
 with col1:
     # Temperature trend analysis
-    temp_slope = np.polyfit(yearly['year'], yearly['temperature_avg'], 1)[0]
-    temp_r2 = r2_score(yearly['temperature_avg'], np.polyval(np.polyfit(yearly['year'], yearly['temperature_avg'], 1), yearly['year']))
+    if model_mode == "Daily seasonal harmonics":
+        temp_slope = harmonic_model['slope_per_year']['temperature_avg']
+        temp_r2 = harmonic_model['r2']['temperature_avg']
+    else:
+        temp_slope = np.polyfit(yearly['year'], yearly['temperature_avg'], 1)[0]
+        temp_r2 = r2_score(yearly['temperature_avg'], np.polyval(np.polyfit(yearly['year'], yearly['temperature_avg'], 1), yearly['year']))
     
     if temp_slope > 0.05:
         temp_trend = "🔺 Warming"
@@ -63,8 +77,13 @@ with col1:
 
 with col2:
     # Precipitation trend analysis
-    rain_slope = np.polyfit(yearly['year'], yearly['precipitation_sum'], 1)[0]
-    rain_r2 = r2_score(yearly['precipitation_sum'], np.polyval(np.polyfit(yearly['year'], yearly['precipitation_sum'], 1), yearly['year']))
+    if model_mode == "Daily seasonal harmonics":
+        # Daily trend in mm/day per year, scaled to annual totals
+        rain_slope = harmonic_model['slope_per_year']['precipitation_sum'] * 365.25
+        rain_r2 = harmonic_model['r2']['precipitation_sum']
+    else:
+        rain_slope = np.polyfit(yearly['year'], yearly['precipitation_sum'], 1)[0]
+        rain_r2 = r2_score(yearly['precipitation_sum'], np.polyval(np.polyfit(yearly['year'], yearly['precipitation_sum'], 1), yearly['year']))
     
     if rain_slope > 10:
         rain_trend = "🔺 Increasing"
@@ -83,6 +102,22 @@ with col2:
         help=f"R² = {rain_r2:.3f} (higher = more reliable trend)"
     )
 
+# Seasonal decomposition from the daily harmonic fit
+if model_mode == "Daily seasonal harmonics":
+    st.markdown("## 🌀 Seasonal Decomposition")
+    
+    decomposition_choice = st.selectbox(
+        "Variable",
+        ["Temperature", "Precipitation"],
+        help="Daily series split into trend, seasonal cycle and anomaly"
+    )
+    column, unit = {
+        "Temperature": ('temperature_avg', "Temperature (°C)"),
+        "Precipitation": ('precipitation_sum', "Precipitation (mm)")
+    }[decomposition_choice]
+    
+    plot_harmonic_decomposition(df, harmonic_model['components'], column, unit)
+
 # Forecasting Section
 st.markdown("## 🔮 Future Climate Projections")
 
@@ -94,97 +129,77 @@ with col1:
 with col2:
     confidence_level = st.selectbox("Confidence Level", [90, 95, 99], index=1, help="Statistical confidence for prediction intervals")
 
+show_regimes = st.checkbox(
+    "Overlay regime shifts",
+    help="Detect step changes in the annual series (PELT segmentation) and draw each segment's mean"
+)
+
 # Prepare data for forecasting
 X = yearly[['year']]
 X_future = pd.DataFrame({'year': range(yearly['year'].max() + 1, yearly['year'].max() + forecast_years + 1)})
-X_combined = pd.concat([X, X_future])
 
 # Temperature forecasting with confidence intervals
 temp_model = LinearRegression().fit(X, yearly['temperature_avg'])
 temp_pred_historical = temp_model.predict(X)
 temp_pred_future = temp_model.predict(X_future)
-temp_pred_all = temp_model.predict(X_combined)
 
-# Calculate prediction intervals (simplified approach)
+# Prediction intervals from a block bootstrap of the residuals
 temp_residuals = yearly['temperature_avg'] - temp_pred_historical
 temp_std = np.std(temp_residuals)
-z_score = {90: 1.645, 95: 1.96, 99: 2.576}[confidence_level]
-temp_margin = z_score * temp_std
+temp_interval = prediction_intervals(
+    yearly['year'].to_numpy(), yearly['temperature_avg'].to_numpy(), forecast_years, confidence_level
+)
+temp_lower, temp_upper = temp_interval['lower'], temp_interval['upper']
 
 # Precipitation forecasting
 rain_model = LinearRegression().fit(X, yearly['precipitation_sum']) 
 rain_pred_historical = rain_model.predict(X)
 rain_pred_future = rain_model.predict(X_future)
-rain_pred_all = rain_model.predict(X_combined)
 
 rain_residuals = yearly['precipitation_sum'] - rain_pred_historical
 rain_std = np.std(rain_residuals)
-rain_margin = z_score * rain_std
-
-# Create interactive forecast plots
-fig = make_subplots(
-    rows=2, cols=1,
-    subplot_titles=('🌡️ Temperature Forecast', '🌧️ Precipitation Forecast'),
-    vertical_spacing=0.1
+rain_interval = prediction_intervals(
+    yearly['year'].to_numpy(), yearly['precipitation_sum'].to_numpy(), forecast_years, confidence_level
 )
+rain_lower, rain_upper = rain_interval['lower'], rain_interval['upper']
 
-# Temperature plot
-fig.add_trace(
-    go.Scatter(x=yearly['year'], y=yearly['temperature_avg'], 
-               mode='markers+lines', name='Historical Temperature',
-               line=dict(color='#ff6b6b', width=2),
-               marker=dict(size=6)), row=1, col=1
-)
+# Regime shifts: one horizontal line per detected segment
+regime_segments = {
+    'temperature_avg': detect_segments(yearly['year'], yearly['temperature_avg']),
+    'precipitation_sum': detect_segments(yearly['year'], yearly['precipitation_sum'])
+} if show_regimes else None
 
-fig.add_trace(
-    go.Scatter(x=X_future['year'], y=temp_pred_future,
-               mode='lines', name='Temperature Forecast', 
-               line=dict(color='#ff6b6b', width=2, dash='dash')), row=1, col=1
-)
-
-# Add confidence intervals for temperature
-fig.add_trace(
-    go.Scatter(x=X_combined['year'], y=temp_pred_all + temp_margin,
-               mode='lines', line=dict(width=0), showlegend=False), row=1, col=1
-)
-fig.add_trace(
-    go.Scatter(x=X_combined['year'], y=temp_pred_all - temp_margin,
-               mode='lines', line=dict(width=0), 
-               fill='tonexty', fillcolor='rgba(255,107,107,0.2)',
-               name=f'{confidence_level}% Confidence'), row=1, col=1
-)
+# Interactive forecast plots with prediction intervals
+st.plotly_chart(forecast_figure(yearly, forecast_years, confidence_level, regime_segments), use_container_width=True)
 
-# Precipitation plot
-fig.add_trace(
-    go.Scatter(x=yearly['year'], y=yearly['precipitation_sum'],
-               mode='markers+lines', name='Historical Precipitation',
-               line=dict(color='#4ecdc4', width=2),
-               marker=dict(size=6)), row=2, col=1
-)
-
-fig.add_trace(
-    go.Scatter(x=X_future['year'], y=rain_pred_future,
-               mode='lines', name='Precipitation Forecast',
-               line=dict(color='#4ecdc4', width=2, dash='dash')), row=2, col=1
-)
-
-# Add confidence intervals for precipitation
-fig.add_trace(
-    go.Scatter(x=X_combined['year'], y=rain_pred_all + rain_margin,
-               mode='lines', line=dict(width=0), showlegend=False), row=2, col=1
-)
-fig.add_trace(
-    go.Scatter(x=X_combined['year'], y=rain_pred_all - rain_margin,
-               mode='lines', line=dict(width=0),
-               fill='tonexty', fillcolor='rgba(78,205,196,0.2)',
-               name=f'{confidence_level}% Confidence'), row=2, col=1
-)
-
-fig.update_layout(height=700, hovermode='x unified', showlegend=True)
-fig.update_yaxes(title_text="Temperature (°C)", row=1, col=1)
-fig.update_yaxes(title_text="Precipitation (mm)", row=2, col=1)
-
-st.plotly_chart(fig, use_container_width=True)
+if show_regimes:
+    with st.expander("🔀 Detected Regime Shifts"):
+        col1, col2 = st.columns(2)
+        
+        for col, column, label, unit in [
+            (col1, 'temperature_avg', "Temperature", "°C"),
+            (col2, 'precipitation_sum', "Precipitation", "mm")
+        ]:
+            with col:
+                st.markdown(f"#### {label}")
+                
+                segments = regime_segments[column]
+                st.write(f"**Annual series:** {len(segments) - 1} shift(s)")
+                st.dataframe(
+                    segments.rename(columns={'start': 'From', 'end': 'To', 'length': 'Years', 'mean': f'Mean ({unit})'}).round(2),
+                    use_container_width=True,
+                    hide_index=True
+                )
+                
+                # Monthly anomalies remove the seasonal cycle before segmenting
+                anomalies = monthly_anomalies(df, column)
+                monthly_segments = detect_segments(anomalies['date'].dt.strftime('%Y-%m'), anomalies['anomaly'], min_size=6)
+                st.write(f"**Monthly anomalies:** {len(monthly_segments) - 1} shift(s)")
+                st.dataframe(
+                    monthly_segments.rename(columns={'start': 'From', 'end': 'To', 'length': 'Months', 'mean': f'Mean Anomaly ({unit})'}).round(2),
+                    use_container_width=True,
+                    hide_index=True
+                )
 
 # Key Projections Summary
 st.markdown("## � Key Projections Summary")
@@ -233,19 +248,19 @@ with st.expander("📊 Model Performance & Reliability"):
         st.write(f"**Trend:** {rain_slope:.1f}mm/year")
         st.write(f"**Standard Error:** ±{rain_std:.0f}mm")
     
-    st.info("💡 **Note:** These are simple linear projections based on historical trends. Actual climate change involves complex, non-linear processes. Use these projections as indicative trends rather than precise predictions.")
+    st.info("💡 **Note:** These are simple linear projections based on historical trends. Actual climate change involves complex, non-linear processes. Use these projections as indicative trends rather than precise predictions. Prediction intervals come from a block bootstrap of the residuals and include trend uncertainty.")
 
 # Forecast data table
 with st.expander("View Detailed Forecast Data"):
     forecast_df = pd.DataFrame({
         'Year': X_future['year'],
         'Temperature Forecast (°C)': temp_pred_future.round(1),
-        'Temperature Range (°C)': [f"{(t-temp_margin):.1f} - {(t+temp_margin):.1f}" for t in temp_pred_future],
+        'Temperature Range (°C)': [f"{lo:.1f} - {hi:.1f}" for lo, hi in zip(temp_lower[len(yearly):], temp_upper[len(yearly):])],
         'Precipitation Forecast (mm)': rain_pred_future.round(0),
-        'Precipitation Range (mm)': [f"{int(r-rain_margin)} - {int(r+rain_margin)}" for r in rain_pred_future]
+        'Precipitation Range (mm)': [f"{int(lo)} - {int(hi)}" for lo, hi in zip(rain_lower[len(yearly):], rain_upper[len(yearly):])]
     })
     
-    st.dataframe(forecast_df, use_container_width=True)
+    paginated_table(forecast_df, key="forecast", searchable=False)
     
     # Download forecast data
     csv = forecast_df.to_csv(index=False)
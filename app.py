@@ -1,4 +1,7 @@
+import os
 import streamlit as st
+from src.api import start_api_server
+from src.warmup import start_warmup
 
 # Streamlit config
 st.set_page_config(
@@ -8,19 +11,36 @@ st.set_page_config(
     page_icon="🌍"
 )
 
+# Warm data, aggregate and figure caches in the background (once per server process).
+# `python -m src.serve` starts this before the first session; then this is a no-op.
+@st.cache_resource
+def start_cache_warmup():
+    return start_warmup()
+
+start_cache_warmup()
+
+# Optionally serve the aggregates API next to the dashboard (once per server process)
+@st.cache_resource
+def start_aggregates_api(port):
+    return start_api_server(port)
+
+if os.environ.get("CLIMATE_API_PORT"):
+    start_aggregates_api(int(os.environ["CLIMATE_API_PORT"]))
+
 # Define pages
 home_page = st.Page("home.py", title="Home", icon="🏠", default=True)
 temperature_page = st.Page("statistics/temperature.py", title="Temperature Trends", icon="🌡️")
 rainfall_page = st.Page("statistics/rainfall.py", title="Rainfall Patterns", icon="🌧️")
 analysis_page = st.Page("analysis/annual_summary.py", title="Annual Summary", icon="📊")
 trends_page = st.Page("analysis/trend_analysis.py", title="Trend Analysis", icon="📈")
+stations_page = st.Page("analysis/station_comparison.py", title="Station Comparison", icon="🗺️")
 
 # Navigation
 pg = st.navigation(
     {
         "Home": [home_page],
         "Statistics": [temperature_page, rainfall_page],
-        "Analysis": [analysis_page, trends_page],
+        "Analysis": [analysis_page, trends_page, stations_page],
     }
 )
 
@@ -0,0 +1,73 @@
+import pandas as pd
+
+# Daily precipitation above this counts as a heavy rain day (mm)
+HEAVY_RAIN_MM = 15
+
+# Display labels for the annual summary columns
+ANNUAL_LABELS = {
+    'temperature_avg_mean': 'Avg Temp (°C)',
+    'temperature_avg_std': 'Temp Std Dev',
+    'temperature_max': 'Max Temp (°C)',
+    'temperature_min': 'Min Temp (°C)',
+    'precipitation_total': 'Total Rain (mm)',
+    'precipitation_daily_mean': 'Daily Rain Avg (mm)',
+    'precipitation_daily_max': 'Max Daily Rain (mm)',
+}
+
+def annual_summary(df):
+    """Annual temperature and precipitation statistics, one row per year"""
+    annual = df.groupby("year").agg({
+        "temperature_avg": ["mean", "std"],
+        "temperature_2m_max": "max",
+        "temperature_2m_min": "min",
+        "precipitation_sum": ["sum", "mean", "max"]
+    }).round(2)
+    annual.columns = list(ANNUAL_LABELS)
+    return annual
+
+def yearly_series(df):
+    """Annual mean temperature, temperature extremes and total precipitation, as the trend models use them"""
+    return df.groupby(df['time'].dt.year).agg({
+        'temperature_avg': 'mean',
+        'temperature_2m_max': 'max',
+        'temperature_2m_min': 'min',
+        'precipitation_sum': 'sum'
+    }).reset_index().rename(columns={'time': 'year'})
+
+def monthly_summary(df):
+    """Monthly temperature and precipitation statistics, one row per year and month"""
+    monthly = df.groupby(["year", "month"]).agg(
+        temperature_avg_mean=("temperature_avg", "mean"),
+        temperature_max=("temperature_2m_max", "max"),
+        temperature_min=("temperature_2m_min", "min"),
+        precipitation_total=("precipitation_sum", "sum"),
+        rain_days=("precipitation_sum", lambda rain: int((rain >= 1).sum())),
+    ).round(2)
+    return monthly
+
+def monthly_temperatures(df):
+    """Mean daily maximum, minimum and average temperature of each calendar month, as the Temperature page lists them"""
+    return df.groupby(pd.to_datetime(df['time']).dt.to_period('M')).agg({
+        'temperature_2m_max': 'mean',
+        'temperature_2m_min': 'mean',
+        'temperature_avg': 'mean'
+    }).round(1).rename_axis('Month')
+
+def monthly_rainfall(df):
+    """Total precipitation of each calendar month, as the Rainfall page lists it"""
+    return df.groupby(pd.to_datetime(df['time']).dt.to_period('M'))['precipitation_sum'].sum().round(1).rename_axis('Month')
+
+def extreme_events(df):
+    """Record days and event counts over the whole frame, one row per event"""
+    hottest = df.loc[df['temperature_2m_max'].idxmax()]
+    coldest = df.loc[df['temperature_2m_min'].idxmin()]
+    wettest = df.loc[df['precipitation_sum'].idxmax()]
+
+    return pd.DataFrame([
+        {'event': 'hottest_day', 'value': hottest['temperature_2m_max'], 'unit': '°C', 'date': hottest['time']},
+        {'event': 'coldest_day', 'value': coldest['temperature_2m_min'], 'unit': '°C', 'date': coldest['time']},
+        {'event': 'wettest_day', 'value': wettest['precipitation_sum'], 'unit': 'mm', 'date': wettest['time']},
+        {'event': 'heavy_rain_days', 'value': int((df['precipitation_sum'] > HEAVY_RAIN_MM).sum()), 'unit': 'days', 'date': None},
+        {'event': 'average_temperature', 'value': round(df['temperature_avg'].mean(), 2), 'unit': '°C', 'date': None},
+        {'event': 'total_precipitation', 'value': round(df['precipitation_sum'].sum(), 1), 'unit': 'mm', 'date': None},
+    ])
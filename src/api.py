@@ -0,0 +1,307 @@
+"""HTTP API over the dashboard's aggregate layer.
+
+Endpoints:
+    GET /health
+    GET /stations
+    GET /aggregates?station=bergen&start=2014&end=2024&granularity=annual&format=json
+    GET /live?station=bergen
+    POST /observations?station=bergen
+
+granularity is one of annual, monthly, extremes or indices; format is json or arrow
+(Arrow IPC stream). /health answers 503 while the dashboard's cache warm-up
+is still running in this process or after it failed, and 200 once it succeeded.
+Responses carry an ETag derived from the station's data
+version and the query, so clients polling with If-None-Match get a 304 without
+any recomputation.
+
+POST /observations takes a JSON list of daily rows (time, temperature_2m_max,
+temperature_2m_min, precipitation_sum) or hourly rows (time, temperature_2m,
+precipitation). Accepted rows are appended to the station's live log and show up
+in /live and the dashboard's running aggregates; rejected rows are quarantined.
+
+Usage:
+    python -m src.api --port 8502
+"""
+import argparse
+import hashlib
+import io
+import json
+import logging
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from src.aggregates import annual_summary, monthly_summary, extreme_events
+from src.indices import annual_indices
+from src.live import append_observations
+from src.shared_utils import file_version, load_station, load_live_aggregates
+from src.stations import discover_stations
+from src.warmup import STATUS as WARMUP_STATUS
+
+DEFAULT_PORT = 8502
+DEFAULT_STATION = "bergen"
+
+logger = logging.getLogger(__name__)
+
+# Clients may reuse a response for this long before revalidating with the ETag
+CACHE_CONTROL = "public, max-age=60, must-revalidate"
+
+GRANULARITIES = {
+    'annual': annual_summary,
+    'monthly': monthly_summary,
+    'extremes': extreme_events,
+    'indices': annual_indices,
+}
+
+ARROW_CONTENT_TYPE = "application/vnd.apache.arrow.stream"
+
+# Largest observation batch accepted in one request
+MAX_BODY_BYTES = 5 * 1024 * 1024
+
+class BadRequest(Exception):
+    """Raised for invalid query parameters"""
+
+def parse_aggregate_query(query):
+    """Validate the query string of an /aggregates request"""
+    params = {key: values[-1] for key, values in parse_qs(query).items()}
+    stations = discover_stations()
+
+    station = params.get('station', DEFAULT_STATION)
+    if station not in stations:
+        raise BadRequest(f"unknown station '{station}'")
+
+    granularity = params.get('granularity', 'annual')
+    if granularity not in GRANULARITIES:
+        raise BadRequest(f"granularity must be one of {', '.join(GRANULARITIES)}")
+
+    output_format = params.get('format', 'json')
+    if output_format not in ('json', 'arrow'):
+        raise BadRequest("format must be json or arrow")
+
+    try:
+        start = int(params['start']) if 'start' in params else None
+        end = int(params['end']) if 'end' in params else None
+    except ValueError:
+        raise BadRequest("start and end must be years")
+
+    return {
+        'station': station,
+        'start': start,
+        'end': end,
+        'granularity': granularity,
+        'format': output_format,
+        'path': stations[station],
+    }
+
+def parse_station(query):
+    """Validate the station of a /live or /observations request"""
+    station = parse_qs(query).get('station', [DEFAULT_STATION])[-1]
+    if station not in discover_stations():
+        raise BadRequest(f"unknown station '{station}'")
+    return station
+
+def make_etag(data_version, request):
+    """Strong ETag from the data version and the normalized request"""
+    key = json.dumps([data_version, request['station'], request['start'], request['end'],
+                      request['granularity'], request['format']])
+    return '"' + hashlib.sha1(key.encode()).hexdigest() + '"'
+
+def compute_aggregate(request):
+    """Run the requested aggregation over the station's data in the year range"""
+    df = load_station(request['station'])
+    start = request['start'] if request['start'] is not None else df['year'].min()
+    end = request['end'] if request['end'] is not None else df['year'].max()
+    filtered_df = df[(df['year'] >= start) & (df['year'] <= end)]
+    if filtered_df.empty:
+        raise BadRequest(f"no data for {start}-{end}")
+    summary = GRANULARITIES[request['granularity']](filtered_df)
+    if request['granularity'] != 'extremes':
+        # Year (and month) index levels become regular columns
+        summary = summary.reset_index()
+    return summary, (start, end)
+
+def _json_value(value):
+    """Timestamps as ISO dates and NaN as null"""
+    if isinstance(value, dict):
+        return {key: _json_value(item) for key, item in value.items()}
+    if isinstance(value, pd.Timestamp):
+        return value.strftime('%Y-%m-%d')
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value
+
+def live_summary(station):
+    """Current month, season and year aggregates and the live days of a station"""
+    live = load_live_aggregates(station)
+    live_through = live.live_through()
+    days = live.live_days()
+    return {
+        'station': station,
+        'live_through': live_through.strftime('%Y-%m-%d') if live_through is not None else None,
+        'periods': _json_value(live.current_periods()),
+        'days': json.loads(days.to_json(orient='records', date_format='iso')),
+    }
+
+def encode_json(result, request, year_range):
+    """Serialize an aggregate frame as a JSON document"""
+    return json.dumps({
+        'station': request['station'],
+        'start': int(year_range[0]),
+        'end': int(year_range[1]),
+        'granularity': request['granularity'],
+        'data': json.loads(result.to_json(orient='records', date_format='iso')),
+    }).encode()
+
+def encode_arrow(result):
+    """Serialize an aggregate frame as an Arrow IPC stream"""
+    table = pa.Table.from_pandas(result, preserve_index=False)
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+class AggregatesHandler(BaseHTTPRequestHandler):
+    """Serve /stations, /aggregates and /live, and accept /observations"""
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        try:
+            if url.path == '/health':
+                self._send_health()
+            elif url.path == '/stations':
+                self._send(HTTPStatus.OK, json.dumps(sorted(discover_stations())).encode(), 'application/json')
+            elif url.path == '/aggregates':
+                self._send_aggregate(url.query)
+            elif url.path == '/live':
+                body = json.dumps(live_summary(parse_station(url.query))).encode()
+                self._send(HTTPStatus.OK, body, 'application/json', {'Cache-Control': 'no-cache'})
+            else:
+                self._send_error(HTTPStatus.NOT_FOUND, f"no such endpoint '{url.path}'")
+        except BadRequest as error:
+            self._send_error(HTTPStatus.BAD_REQUEST, str(error))
+        except Exception:
+            # Any other failure still gets an answer instead of a dropped connection
+            logger.exception("Error handling %s %s", self.command, self.path)
+            self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, "internal server error")
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        try:
+            if url.path == '/observations':
+                self._receive_observations(url.query)
+            else:
+                self._send_error(HTTPStatus.NOT_FOUND, f"no such endpoint '{url.path}'")
+        except BadRequest as error:
+            self._send_error(HTTPStatus.BAD_REQUEST, str(error))
+        except Exception:
+            # Any other failure still gets an answer instead of a dropped connection
+            logger.exception("Error handling %s %s", self.command, self.path)
+            self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, "internal server error")
+
+    def _receive_observations(self, query):
+        station = parse_station(query)
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            raise BadRequest("Content-Length must be an integer")
+        if length < 0:
+            raise BadRequest("Content-Length must not be negative")
+        if length > MAX_BODY_BYTES:
+            self._send_error(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"batches are limited to {MAX_BODY_BYTES} bytes")
+            return
+
+        try:
+            rows = json.loads(self.rfile.read(length))
+        except ValueError:
+            raise BadRequest("body must be a JSON list of observations")
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise BadRequest("body must be a JSON list of observations")
+
+        try:
+            result = append_observations(rows, station, load_station(station)['time'])
+        except ValueError as error:
+            raise BadRequest(str(error))
+        self._send(HTTPStatus.OK, json.dumps(result).encode(), 'application/json')
+
+    def _send_health(self):
+        # Only an unfinished or failed warm-up in this process makes the service not ready
+        status = WARMUP_STATUS.as_dict()
+        healthy = status['ready'] or not status['started']
+        self._send(
+            HTTPStatus.OK if healthy else HTTPStatus.SERVICE_UNAVAILABLE,
+            json.dumps(status).encode(),
+            'application/json',
+            {'Cache-Control': 'no-store'}
+        )
+
+    def _send_aggregate(self, query):
+        request = parse_aggregate_query(query)
+        etag = make_etag(file_version(request['path']), request)
+
+        # Unchanged data and query: answer before loading or aggregating anything
+        if etag in [tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')]:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', CACHE_CONTROL)
+            self.end_headers()
+            return
+
+        result, year_range = compute_aggregate(request)
+        if request['format'] == 'arrow':
+            body, content_type = encode_arrow(result), ARROW_CONTENT_TYPE
+        else:
+            body, content_type = encode_json(result, request, year_range), 'application/json'
+        self._send(HTTPStatus.OK, body, content_type, {'ETag': etag, 'Cache-Control': CACHE_CONTROL})
+
+    def _send(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status, message):
+        self._send(status, json.dumps({'error': message}).encode(), 'application/json')
+
+    def log_message(self, format, *args):
+        # Keep the dashboard's console free of per-request lines
+        pass
+
+_servers = {}
+
+def start_api_server(port=DEFAULT_PORT, host="127.0.0.1"):
+    """Start the API in a daemon thread and return the server, or None if the port cannot be bound"""
+    if (host, port) in _servers:
+        return _servers[host, port]
+    try:
+        server = ThreadingHTTPServer((host, port), AggregatesHandler)
+    except OSError as error:
+        # Another process (e.g. a second dashboard worker) may already serve this port
+        logger.error("Aggregates API not started on %s:%s: %s", host, port, error)
+        return None
+    threading.Thread(target=server.serve_forever, name="aggregates-api", daemon=True).start()
+    _servers[host, port] = server
+    return server
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve climate aggregates over HTTP")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to listen on")
+    args = parser.parse_args(argv)
+
+    server = ThreadingHTTPServer((args.host, args.port), AggregatesHandler)
+    print(f"Serving aggregates on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+
+def _noise_variance(values):
+    """Robust noise variance from first differences, insensitive to the level shifts themselves"""
+    differences = np.diff(values)
+    if len(differences) == 0:
+        return 0.0
+    mad = np.median(np.abs(differences - np.median(differences)))
+    # MAD of differences of i.i.d. noise is sqrt(2) * 0.6745 * sigma
+    sigma = mad / (0.6745 * np.sqrt(2))
+    return sigma ** 2 if sigma > 0 else np.var(values)
+
+def pelt(values, penalty=None, min_size=2):
+    """Change points of the mean of a series with the PELT algorithm.
+
+    Segment costs are sums of squared deviations from the segment mean, taken in
+    O(1) from cumulative sums; pruning keeps the search close to linear in the
+    series length. The default penalty is BIC-like: 2 * noise variance * log(n).
+    Returns the sorted indices where new segments start (excluding 0).
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    if n < 2 * min_size:
+        return []
+
+    if penalty is None:
+        penalty = 2 * _noise_variance(values) * np.log(n)
+
+    cumulative = np.concatenate([[0.0], np.cumsum(values)])
+    cumulative_sq = np.concatenate([[0.0], np.cumsum(values ** 2)])
+
+    def segment_cost(starts, end):
+        lengths = end - starts
+        sums = cumulative[end] - cumulative[starts]
+        return cumulative_sq[end] - cumulative_sq[starts] - sums ** 2 / lengths
+
+    best_cost = np.full(n + 1, np.inf)
+    best_cost[0] = -penalty
+    previous = np.zeros(n + 1, dtype=int)
+    candidates = np.array([0])
+    # Starts dominated by a change at t can only be dropped once a segment from t is long enough
+    pending_pruning = {}
+
+    for end in range(min_size, n + 1):
+        if end in pending_pruning:
+            candidates = candidates[~np.isin(candidates, pending_pruning.pop(end))]
+
+        costs = best_cost[candidates] + segment_cost(candidates, end)
+        best = np.argmin(costs)
+        best_cost[end] = costs[best] + penalty
+        previous[end] = candidates[best]
+
+        pending_pruning[end + min_size] = candidates[costs > best_cost[end]]
+        # The start that first reaches the minimum segment length at the next step
+        candidates = np.append(candidates, end - min_size + 1)
+
+    change_points = []
+    end = n
+    while end > 0:
+        end = previous[end]
+        if end > 0:
+            change_points.append(int(end))
+    return sorted(change_points)
+
+def segment_means(values, change_points):
+    """Split a series at change points and return (start, end, mean) per segment"""
+    values = np.asarray(values, dtype=float)
+    bounds = [0] + list(change_points) + [len(values)]
+    return [(start, end, values[start:end].mean()) for start, end in zip(bounds[:-1], bounds[1:])]
+
+def detect_segments(index, values, penalty=None, min_size=2):
+    """Segment a series and describe each segment by its first and last index label and mean"""
+    index = np.asarray(index)
+    values = np.asarray(values, dtype=float)
+    segments = segment_means(values, pelt(values, penalty, min_size))
+    return pd.DataFrame(
+        [(index[start], index[end - 1], end - start, mean) for start, end, mean in segments],
+        columns=['start', 'end', 'length', 'mean']
+    )
+
+def batch_changepoints(matrix, penalty=None, min_size=2):
+    """Change points for every row of a (series x time) array, e.g. all stations at once.
+
+    NaN cells (years without data) are skipped; indices refer to the original columns.
+    """
+    matrix = np.atleast_2d(np.asarray(matrix, dtype=float))
+    results = []
+    for row in matrix:
+        observed = np.flatnonzero(~np.isnan(row))
+        results.append([int(observed[i]) for i in pelt(row[observed], penalty, min_size)])
+    return results
+
+def monthly_anomalies(df, column):
+    """Monthly means (or totals for precipitation) minus their calendar-month climatology"""
+    how = 'sum' if column == 'precipitation_sum' else 'mean'
+    monthly = df.groupby(['year', 'month'])[column].agg(how)
+    climatology = monthly.groupby(level='month').transform('mean')
+    anomalies = (monthly - climatology).reset_index(name='anomaly')
+    anomalies['date'] = pd.to_datetime(dict(year=anomalies['year'], month=anomalies['month'], day=1))
+    return anomalies
@@ -0,0 +1,360 @@
+"""Headless export of the dashboard's default views as static HTML and JSON bundles.
+
+Renders the Temperature, Rainfall, Annual Summary and Trend Analysis views for
+each station and year range, and the Station Comparison view across the
+exported stations for each range. Figures come from the same builders the
+pages use; tables come from the aggregate layer shared with the pages and the
+API. Interactive controls are exported at their defaults. Every bundle is
+rendered in its own worker process. The output only needs a plain file server
+or CDN:
+
+    <out>/index.html
+    <out>/manifest.json
+    <out>/<station>/<start>-<end>/<page>.html
+    <out>/<station>/<start>-<end>/<page>.json
+    <out>/all_stations/<start>-<end>/station_comparison.html
+    <out>/all_stations/<start>-<end>/station_comparison.json
+
+Usage:
+    python -m src.export_snapshots --out snapshots --ranges 2014-2024 2020-2024 --workers 4
+"""
+import argparse
+import html
+import json
+import logging
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from src.process_data import process_data
+from src.stations import discover_stations, station_label, station_year_cube, compare_stations
+from src.shared_utils import file_version
+from src.sketches import build_year_sketches, describe_range
+from src.aggregates import (
+    annual_summary, monthly_temperatures, monthly_rainfall, extreme_events, yearly_series, ANNUAL_LABELS
+)
+from src.indices import annual_indices, standardized_precipitation_index, SPI_MONTHS
+from src.forecast import prediction_intervals
+from src.changepoints import batch_changepoints
+from src.plots import (
+    temperature_trends_figure, calendar_heatmap_figure, rainfall_figures, annual_average_figures,
+    forecast_figure, spi_figure, station_small_multiples_figure, station_year_heatmap_figure
+)
+from src.warmup import DEFAULT_FORECAST_YEARS, DEFAULT_CONFIDENCE
+
+DEFAULT_OUT_DIR = "snapshots"
+
+# Bundle folder of the cross-station view
+COMPARISON_BUNDLE = "all_stations"
+
+# Station Comparison controls as the page first renders them
+DEFAULT_COMPARISON_PANELS = 12
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: sans-serif; margin: 2rem auto; max-width: 1200px; padding: 0 1rem; }}
+table {{ border-collapse: collapse; margin-bottom: 2rem; font-size: 0.9rem; }}
+th, td {{ padding: 0.3rem 0.7rem; border-bottom: 1px solid #ddd; text-align: right; }}
+.metrics {{ display: flex; gap: 2rem; flex-wrap: wrap; list-style: none; padding: 0; }}
+.metrics li span {{ display: block; font-size: 1.5rem; }}
+</style>
+</head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+def temperature_snapshot(df, station_df, year_range):
+    """Figures, metrics and tables of the Temperature Trends page"""
+    columns = ['temperature_2m_max', 'temperature_2m_min', 'temperature_avg']
+    sketches = build_year_sketches(station_df, columns)
+    return {
+        'title': "Temperature Trends",
+        'figures': [temperature_trends_figure(df), calendar_heatmap_figure(df, "Temperature")],
+        'metrics': {
+            'Highest Temperature (°C)': round(df['temperature_2m_max'].max(), 1),
+            'Lowest Temperature (°C)': round(df['temperature_2m_min'].min(), 1),
+            'Average Temperature (°C)': round(df['temperature_avg'].mean(), 1),
+        },
+        'tables': {
+            'Temperature Statistics': describe_range(sketches, columns, year_range).round(1).reset_index(names='statistic'),
+            'Monthly Temperature Averages': monthly_temperatures(df).reset_index().astype({'Month': str}),
+        },
+    }
+
+def rainfall_snapshot(df, station_df, year_range):
+    """Figures, metrics and tables of the Rainfall Patterns page"""
+    sketches = build_year_sketches(station_df, ['precipitation_sum'])
+    monthly_fig, daily_fig = rainfall_figures(df)
+    wettest_day = df.loc[df['precipitation_sum'].idxmax()]
+    return {
+        'title': "Rainfall Patterns",
+        'figures': [monthly_fig, daily_fig],
+        'metrics': {
+            'Wettest Day': f"{wettest_day['time']:%Y-%m-%d} ({wettest_day['precipitation_sum']:.1f} mm)",
+            'Average Daily Rainfall (mm)': round(df['precipitation_sum'].mean(), 1),
+            'Total Rainfall (mm)': round(df['precipitation_sum'].sum(), 0),
+        },
+        'tables': {
+            'Rainfall Statistics': describe_range(sketches, ['precipitation_sum'], year_range).round(2).reset_index(names='statistic'),
+            'Monthly Precipitation Totals': monthly_rainfall(df).to_frame('Total (mm)').reset_index().astype({'Month': str}),
+        },
+    }
+
+def annual_summary_snapshot(df, station_df, year_range):
+    """Figures, metrics and tables of the Annual Summary page"""
+    temp_fig, precip_fig, _ = annual_average_figures(df)
+
+    # Indices are computed over the whole record, as on the page, then sliced to the range
+    indices = annual_indices(station_df).loc[year_range[0]:year_range[1]]
+    spi = standardized_precipitation_index(station_df)
+    range_spi = spi[(spi['year'] >= year_range[0]) & (spi['year'] <= year_range[1])]
+
+    return {
+        'title': "Annual Climate Summary",
+        'figures': [temp_fig, precip_fig, spi_figure(range_spi, SPI_MONTHS)],
+        'metrics': {
+            'Heating Degree Days (per year)': round(indices['heating_degree_days'].mean(), 0),
+            'Cooling Degree Days (per year)': round(indices['cooling_degree_days'].mean(), 0),
+            'Longest Dry Spell (days)': int(indices['longest_dry_spell'].max()),
+            'Longest Wet Spell (days)': int(indices['longest_wet_spell'].max()),
+        },
+        'tables': {
+            'Year-over-Year Analysis': annual_summary(df).rename(columns=ANNUAL_LABELS).reset_index(),
+            'Climate Indices': indices.reset_index(),
+            'Extreme Weather Events': extreme_events(df),
+        },
+    }
+
+def trends_snapshot(df, station_df, year_range):
+    """Figures, metrics and tables of the Trend Analysis page at its default forecast settings"""
+    yearly = yearly_series(df)
+    if len(yearly) < 2:
+        return None
+
+    forecast = pd.DataFrame({'year': yearly['year'].max() + 1 + pd.RangeIndex(DEFAULT_FORECAST_YEARS)})
+    metrics = {}
+    for column, name, unit in [('temperature_avg', 'Temperature', '°C'), ('precipitation_sum', 'Precipitation', 'mm')]:
+        interval = prediction_intervals(
+            yearly['year'].to_numpy(), yearly[column].to_numpy(), DEFAULT_FORECAST_YEARS, DEFAULT_CONFIDENCE
+        )
+        future = slice(len(yearly), None)
+        forecast[f'{name} Forecast ({unit})'] = interval['forecast'][future].round(1)
+        forecast[f'{name} Lower ({unit})'] = interval['lower'][future].round(1)
+        forecast[f'{name} Upper ({unit})'] = interval['upper'][future].round(1)
+        metrics[f'{name} Change by {forecast["year"].iloc[-1]} ({unit})'] = round(interval['forecast'][-1] - yearly[column].iloc[-1], 1)
+
+    return {
+        'title': "Climate Trend Analysis & Forecasting",
+        'figures': [forecast_figure(yearly, DEFAULT_FORECAST_YEARS, DEFAULT_CONFIDENCE, None)],
+        'metrics': metrics,
+        'tables': {
+            'Annual Series': yearly.round(2),
+            f'Forecast ({DEFAULT_CONFIDENCE}% Prediction Interval)': forecast,
+        },
+    }
+
+def station_comparison_snapshot(cube, year_range):
+    """Figures and ranking of the Station Comparison page at its default controls"""
+    comparison = compare_stations(cube, year_range)
+    selected_years = (cube['years'] >= year_range[0]) & (cube['years'] <= year_range[1])
+    comparison['Temp Regime Shifts'] = [len(shifts) for shifts in batch_changepoints(cube['temp_mean'][:, selected_years])]
+
+    # Ranked by the first statistic, highest first; the top stations get a panel each
+    rank_by = comparison.columns[0]
+    ranked = comparison.sort_values(rank_by, ascending=False)
+    ranked.insert(0, 'Rank', np.arange(1, len(ranked) + 1))
+    station_positions = {label: i for i, label in enumerate(comparison.index)}
+    top_stations = [station_positions[label] for label in ranked.index[:DEFAULT_COMPARISON_PANELS]]
+
+    return {
+        'title': "Station Comparison",
+        'figures': [
+            station_small_multiples_figure(cube, top_stations, year_range, 'temp_mean', 'Avg Temp (°C)'),
+            station_year_heatmap_figure(cube, year_range, 'temp_mean', 'Avg Temp (°C)'),
+        ],
+        'metrics': {'Stations': len(comparison)},
+        'tables': {f'Station Rankings by {rank_by}': ranked.round(3).reset_index()},
+    }
+
+PAGES = {
+    'temperature': temperature_snapshot,
+    'rainfall': rainfall_snapshot,
+    'annual_summary': annual_summary_snapshot,
+    'trends': trends_snapshot,
+}
+
+def render_html(snapshot, station, year_range):
+    """Standalone HTML page; plotly.js is loaded once from its CDN"""
+    heading = f"{snapshot['title']} — {station_label(station)}, {year_range[0]}-{year_range[1]}"
+    parts = [f"<h1>{html.escape(heading)}</h1>", '<ul class="metrics">']
+    for name, value in snapshot['metrics'].items():
+        parts.append(f"<li>{html.escape(name)}<span>{html.escape(str(value))}</span></li>")
+    parts.append("</ul>")
+
+    for i, fig in enumerate(snapshot['figures']):
+        parts.append(fig.to_html(full_html=False, include_plotlyjs='cdn' if i == 0 else False))
+
+    for name, table in snapshot['tables'].items():
+        parts.append(f"<h2>{html.escape(name)}</h2>")
+        parts.append(table.to_html(index=False, border=0, na_rep=""))
+
+    return PAGE_TEMPLATE.format(title=html.escape(heading), body="\n".join(parts))
+
+def render_json(snapshot, station, year_range):
+    """JSON bundle with the metrics, table records and plotly figure specs"""
+    return json.dumps({
+        'station': station,
+        'start': int(year_range[0]),
+        'end': int(year_range[1]),
+        'title': snapshot['title'],
+        'metrics': snapshot['metrics'],
+        'tables': {name: json.loads(table.to_json(orient='records', date_format='iso'))
+                   for name, table in snapshot['tables'].items()},
+        'figures': [json.loads(fig.to_json()) for fig in snapshot['figures']],
+    }, default=str)
+
+def write_page(snapshot, page, station, year_range, out_dir, bundle_dir):
+    """Write the HTML and JSON files of one page and return its manifest entry"""
+    for extension, render in [('html', render_html), ('json', render_json)]:
+        with open(os.path.join(out_dir, bundle_dir, f"{page}.{extension}"), "w", encoding="utf-8") as f:
+            f.write(render(snapshot, station, year_range))
+    return {'title': snapshot['title'], 'html': f"{bundle_dir}/{page}.html", 'json': f"{bundle_dir}/{page}.json"}
+
+def _quiet_worker():
+    # Cached builders run without a Streamlit runtime here
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    warnings.filterwarnings("ignore")
+
+def export_snapshot(station, path, year_range, out_dir):
+    """Render every page of one station and year range; runs in a worker process"""
+    _quiet_worker()
+
+    started = time.perf_counter()
+    station_df = process_data(pd.read_csv(path))
+    df = station_df[(station_df['year'] >= year_range[0]) & (station_df['year'] <= year_range[1])]
+
+    bundle_dir = os.path.join(station, f"{year_range[0]}-{year_range[1]}")
+    os.makedirs(os.path.join(out_dir, bundle_dir), exist_ok=True)
+
+    pages = {}
+    for page, build in PAGES.items():
+        snapshot = build(df, station_df, year_range) if len(df) else None
+        if snapshot is None:
+            continue
+        pages[page] = write_page(snapshot, page, station, year_range, out_dir, bundle_dir)
+
+    return {
+        'station': station,
+        'start': int(year_range[0]),
+        'end': int(year_range[1]),
+        'data_version': file_version(path),
+        'pages': pages,
+        'seconds': round(time.perf_counter() - started, 2),
+    }
+
+def export_comparison(paths, year_range, out_dir):
+    """Render the Station Comparison page over the given stations for one year range; runs in a worker process"""
+    _quiet_worker()
+
+    started = time.perf_counter()
+    frames = [process_data(pd.read_csv(path)).assign(station=station) for station, path in paths.items()]
+    cube = station_year_cube(pd.concat(frames, ignore_index=True))
+
+    bundle_dir = os.path.join(COMPARISON_BUNDLE, f"{year_range[0]}-{year_range[1]}")
+    os.makedirs(os.path.join(out_dir, bundle_dir), exist_ok=True)
+
+    pages = {}
+    if ((cube['years'] >= year_range[0]) & (cube['years'] <= year_range[1])).any():
+        snapshot = station_comparison_snapshot(cube, year_range)
+        pages['station_comparison'] = write_page(snapshot, 'station_comparison', COMPARISON_BUNDLE, year_range, out_dir, bundle_dir)
+
+    return {
+        'station': COMPARISON_BUNDLE,
+        'start': int(year_range[0]),
+        'end': int(year_range[1]),
+        'data_version': "|".join(f"{station}:{file_version(path)}" for station, path in paths.items()),
+        'pages': pages,
+        'seconds': round(time.perf_counter() - started, 2),
+    }
+
+def render_index(bundles):
+    """Landing page linking every exported bundle"""
+    parts = ["<h1>Climate Dashboard Snapshots</h1>"]
+    for bundle in bundles:
+        parts.append(f"<h2>{html.escape(station_label(bundle['station']))}, {bundle['start']}-{bundle['end']}</h2><ul>")
+        for page in bundle['pages'].values():
+            parts.append(f'<li><a href="{page["html"]}">{html.escape(page["title"])}</a> '
+                         f'(<a href="{page["json"]}">JSON</a>)</li>')
+        parts.append("</ul>")
+    return PAGE_TEMPLATE.format(title="Climate Dashboard Snapshots", body="\n".join(parts))
+
+def parse_range(text):
+    """'2014-2024' as (2014, 2024)"""
+    try:
+        start, end = (int(year) for year in text.split("-"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{text}' is not a year range like 2014-2024")
+    if start > end:
+        raise argparse.ArgumentTypeError(f"range '{text}' ends before it starts")
+    return start, end
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export static snapshots of the dashboard pages")
+    parser.add_argument("--out", default=DEFAULT_OUT_DIR, help="Output directory")
+    parser.add_argument("--stations", nargs="*", help="Stations to export (default: all)")
+    parser.add_argument("--ranges", nargs="*", type=parse_range,
+                        help="Year ranges like 2014-2024 (default: each station's full range)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes")
+    args = parser.parse_args(argv)
+
+    stations = discover_stations()
+    selected = args.stations or sorted(stations)
+    unknown = [station for station in selected if station not in stations]
+    if unknown:
+        parser.error(f"unknown station(s): {', '.join(unknown)}")
+
+    jobs = []
+    full_ranges = []
+    for station in selected:
+        if args.ranges:
+            ranges = args.ranges
+        else:
+            years = pd.to_datetime(pd.read_csv(stations[station], usecols=['time'])['time']).dt.year
+            ranges = [(int(years.min()), int(years.max()))]
+            full_ranges.extend(ranges)
+        jobs.extend((station, stations[station], year_range) for year_range in ranges)
+
+    # The comparison covers every exported station, over the given ranges or all their years
+    comparison_ranges = args.ranges or [(min(start for start, _ in full_ranges), max(end for _, end in full_ranges))]
+    selected_paths = {station: stations[station] for station in selected}
+
+    started = time.perf_counter()
+    bundles = []
+    with ProcessPoolExecutor(max_workers=max(1, min(args.workers, len(jobs) + len(comparison_ranges)))) as pool:
+        futures = [pool.submit(export_snapshot, station, path, year_range, args.out) for station, path, year_range in jobs]
+        futures += [pool.submit(export_comparison, selected_paths, year_range, args.out) for year_range in comparison_ranges]
+        for future in as_completed(futures):
+            bundle = future.result()
+            bundles.append(bundle)
+            print(f"{bundle['station']} {bundle['start']}-{bundle['end']}: {len(bundle['pages'])} pages in {bundle['seconds']}s")
+
+    bundles.sort(key=lambda bundle: (bundle['station'], bundle['start'], bundle['end']))
+    with open(os.path.join(args.out, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump({'generated_at': pd.Timestamp.now().isoformat(timespec='seconds'), 'bundles': bundles}, f, indent=2)
+    with open(os.path.join(args.out, "index.html"), "w", encoding="utf-8") as f:
+        f.write(render_index(bundles))
+
+    print(f"Exported {len(bundles)} bundle(s) to {args.out} in {time.perf_counter() - started:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 import requests
 import pandas as pd
+from src.validation import validate_batch, write_quarantine, format_report
 
 # Bergen coordinates
 latitude = 60.3913
@@ -9,28 +10,60 @@ longitude = 5.3221
 start_date = "2014-01-01"
 end_date = "2024-12-31"
 
-# Build URL
-url = (
-    f"https://archive-api.open-meteo.com/v1/archive?"
-    f"latitude={latitude}&longitude={longitude}"
-    f"&start_date={start_date}&end_date={end_date}"
-    "&daily=temperature_2m_max,temperature_2m_min,precipitation_sum"
-    "&timezone=Europe%2FOslo"
-)
+def fetch_daily(latitude, longitude, start_date, end_date):
+    """Daily temperature and precipitation from the Open-Meteo archive"""
+    # Build URL
+    url = (
+        f"https://archive-api.open-meteo.com/v1/archive?"
+        f"latitude={latitude}&longitude={longitude}"
+        f"&start_date={start_date}&end_date={end_date}"
+        "&daily=temperature_2m_max,temperature_2m_min,precipitation_sum"
+        "&timezone=Europe%2FOslo"
+    )
 
-# Fetch data
-response = requests.get(url)
-data = response.json()
+    # Fetch data
+    response = requests.get(url)
+    data = response.json()
 
-# Convert to DataFrame
-df = pd.DataFrame(data['daily'])
-df['time'] = pd.to_datetime(df['time'])
+    # Convert to DataFrame
+    return pd.DataFrame(data['daily'])
 
-# Calculate average temperature
-df['temperature_avg'] = (df['temperature_2m_max'] + df['temperature_2m_min']) / 2
+def fetch_recent_hourly(latitude, longitude, past_days=1):
+    """Recent hourly temperature and precipitation from the Open-Meteo forecast API"""
+    url = (
+        f"https://api.open-meteo.com/v1/forecast?"
+        f"latitude={latitude}&longitude={longitude}"
+        f"&past_days={past_days}&forecast_days=1"
+        "&hourly=temperature_2m,precipitation"
+        "&timezone=Europe%2FOslo"
+    )
 
-# Preview
-print(df.head())
+    response = requests.get(url)
+    df = pd.DataFrame(response.json()['hourly'])
 
-# Save to CSV
-df.to_csv("bergen_climate_data.csv", index=False)
+    # Hours still ahead are forecasts, not observations
+    now = pd.Timestamp.now(tz="Europe/Oslo").tz_localize(None)
+    return df[pd.to_datetime(df['time']) <= now]
+
+if __name__ == "__main__":
+    df = fetch_daily(latitude, longitude, start_date, end_date)
+
+    # Validate the batch before it lands in the dataset
+    df, quarantine, report = validate_batch(df)
+    print(format_report(report))
+
+    quarantine_path = write_quarantine(quarantine, "bergen")
+    if quarantine_path:
+        print(f"Quarantined rows appended to {quarantine_path}")
+
+    df = df.copy()
+    df['time'] = pd.to_datetime(df['time'])
+
+    # Calculate average temperature
+    df['temperature_avg'] = (df['temperature_2m_max'] + df['temperature_2m_min']) / 2
+
+    # Preview
+    print(df.head())
+
+    # Save to CSV
+    df.to_csv("bergen_climate_data.csv", index=False)
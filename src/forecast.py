@@ -0,0 +1,130 @@
+import numpy as np
+import streamlit as st
+
+# Number of bootstrap resamples used for prediction intervals
+N_RESAMPLES = 4000
+
+def _block_indices(rng, n_obs, length, block_length, n_resamples):
+    """Draw circular block bootstrap indices of shape (n_resamples, length) into n_obs residuals.
+
+    Blocks wrap around the end of the series so every residual is drawn equally
+    often; plain moving blocks undersample the first and last years.
+    """
+    block_length = min(block_length, n_obs)
+    n_blocks = int(np.ceil(length / block_length))
+    starts = rng.integers(0, n_obs, size=(n_resamples, n_blocks))
+    indices = (starts[:, :, None] + np.arange(block_length)) % n_obs
+    return indices.reshape(n_resamples, -1)[:, :length]
+
+def bootstrap_prediction_intervals(years, values, future_years, confidence,
+                                   n_resamples=N_RESAMPLES, block_length=None, seed=0):
+    """Linear-trend prediction intervals from a studentized residual block bootstrap.
+
+    Residuals are inflated by their leverage so they carry out-of-sample error,
+    and each resample's prediction error is divided by its own residual scale so
+    the interval widens for short records the way a t interval does. All
+    resampled series are refitted with one batched least-squares solve.
+    Returns the point forecast and interval bounds for years followed by future_years.
+    """
+    years = np.asarray(years, dtype=float)
+    values = np.asarray(values, dtype=float)
+    all_years = np.concatenate([years, np.asarray(future_years, dtype=float)])
+    n_obs, n_params = len(years), 2
+
+    # Center the regressor for a well-conditioned design matrix
+    center = years.mean()
+    X = np.column_stack([np.ones(n_obs), years - center])
+    X_all = np.column_stack([np.ones(len(all_years)), all_years - center])
+
+    beta, *_ = np.linalg.lstsq(X, values, rcond=None)
+    fitted = X @ beta
+    forecast = X_all @ beta
+    residuals = values - fitted
+
+    # Leverage of the observed years and of the years predicted
+    XtX_inv = np.linalg.pinv(X.T @ X)
+    leverage = np.einsum('ij,jk,ik->i', X, XtX_inv, X)
+    prediction_leverage = np.einsum('ij,jk,ik->i', X_all, XtX_inv, X_all)
+
+    # Leverage-adjusted residuals have the variance of a new observation's error; re-center them
+    residuals = residuals / np.sqrt(np.clip(1 - leverage, 1e-12, None))
+    residuals = residuals - residuals.mean()
+
+    if block_length is None:
+        # Blocks of about n^(1/3) keep short-range autocorrelation intact. Without
+        # significant lag-1 autocorrelation they only shrink the resampled trend
+        # variance, so single years are resampled instead.
+        autocorrelation = np.corrcoef(residuals[:-1], residuals[1:])[0, 1] if n_obs > 3 else 0.0
+        correlated = np.isfinite(autocorrelation) and autocorrelation > 2 / np.sqrt(n_obs)
+        block_length = max(1, int(round(n_obs ** (1 / 3)))) if correlated else 1
+
+    rng = np.random.default_rng(seed)
+
+    # Resampled histories: fitted trend plus block-resampled residuals, shape (B, n)
+    history_noise = residuals[_block_indices(rng, n_obs, n_obs, block_length, n_resamples)]
+    resampled = fitted + history_noise
+
+    # Refit every resample at once: one solve with B right-hand sides (parameter uncertainty)
+    betas, *_ = np.linalg.lstsq(X, resampled.T, rcond=None)
+
+    # New observations add their own block-resampled noise (observation uncertainty)
+    future_noise = residuals[_block_indices(rng, n_obs, len(all_years), block_length, n_resamples)]
+    prediction_error = forecast + future_noise - (X_all @ betas).T
+
+    tail = (1 - confidence / 100) / 2
+    scale = np.sqrt(np.sum((values - fitted) ** 2) / (n_obs - n_params)) if n_obs > n_params else 0.0
+
+    if n_obs - n_params >= 2 and scale > 0:
+        # Studentize: each resample's error over its own residual scale and standard error
+        resampled_scale = np.sqrt(np.sum((resampled - (X @ betas).T) ** 2, axis=1) / (n_obs - n_params))
+        standard_error = np.sqrt(1 + prediction_leverage)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pivot = prediction_error / (resampled_scale[:, None] * standard_error)
+        # Resamples that repeat one residual fit exactly and have no scale to divide by
+        pivot[resampled_scale < scale * 1e-3] = np.nan
+        low, high = np.nanquantile(pivot, [tail, 1 - tail], axis=0)
+        lower = forecast + low * scale * standard_error
+        upper = forecast + high * scale * standard_error
+    else:
+        # Too few points to estimate a scale reliably: use the raw simulated errors
+        low, high = np.quantile(prediction_error, [tail, 1 - tail], axis=0)
+        lower, upper = forecast + low, forecast + high
+
+    return {
+        'year': all_years.astype(int),
+        'forecast': forecast,
+        'lower': lower,
+        'upper': upper,
+    }
+
+def interval_coverage(n_years=11, horizon=20, confidence=95, n_simulations=300,
+                      slope=0.03, noise=0.6, n_resamples=1000, seed=0):
+    """Share of simulated future values inside the prediction interval.
+
+    Draws linear-trend series with Gaussian noise, builds intervals from the first
+    n_years and checks them against the next horizon years. Should be close to
+    confidence / 100.
+    """
+    rng = np.random.default_rng(seed)
+    years = np.arange(n_years)
+    future_years = np.arange(n_years, n_years + horizon)
+    hits = 0
+    for i in range(n_simulations):
+        values = slope * years + rng.normal(0, noise, n_years)
+        future_values = slope * future_years + rng.normal(0, noise, horizon)
+        interval = bootstrap_prediction_intervals(years, values, future_years, confidence,
+                                                  n_resamples=n_resamples, seed=i)
+        inside = (future_values >= interval['lower'][n_years:]) & (future_values <= interval['upper'][n_years:])
+        hits += inside.sum()
+    return hits / (n_simulations * horizon)
+
+@st.cache_data(show_spinner=False)
+def prediction_intervals(years, values, horizon, confidence):
+    """Cached prediction intervals for a yearly series over the next horizon years"""
+    years = np.asarray(years)
+    future_years = np.arange(years.max() + 1, years.max() + horizon + 1)
+    return bootstrap_prediction_intervals(years, values, future_years, confidence)
+
+if __name__ == "__main__":
+    for n_years in (5, 11, 30):
+        print(f"{n_years} years, 95% intervals: {interval_coverage(n_years=n_years):.1%} coverage")
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+
+# Daily variables fitted by the seasonal harmonic model
+HARMONIC_COLUMNS = ['temperature_avg', 'precipitation_sum']
+
+# Mean length of a year in days, so harmonics stay in phase across leap years
+YEAR_LENGTH = 365.25
+
+# Design matrix columns: intercept, linear trend, annual and semiannual harmonics
+DESIGN_COLUMNS = ['intercept', 'trend', 'annual_cos', 'annual_sin', 'semiannual_cos', 'semiannual_sin']
+
+def harmonic_design_matrix(times, origin=None):
+    """Build the trend + annual + semiannual harmonic design matrix for daily timestamps"""
+    times = pd.to_datetime(pd.Series(times))
+    if origin is None:
+        origin = times.min()
+    # Time in fractional years since the origin
+    t = ((times - origin).dt.total_seconds() / 86400 / YEAR_LENGTH).to_numpy()
+    angle = 2 * np.pi * t
+    return np.column_stack([
+        np.ones_like(t),
+        t,
+        np.cos(angle),
+        np.sin(angle),
+        np.cos(2 * angle),
+        np.sin(2 * angle),
+    ])
+
+def fit_harmonics(design, values):
+    """Fit the harmonic model to every column of values with one batched solve.
+
+    values has shape (n_days, n_series), where series are variables and/or stations
+    sharing the same dates. Missing values are masked out per series.
+    Returns coefficients of shape (n_series, n_params) and the R² of each series.
+    """
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 1:
+        values = values[:, None]
+
+    mask = ~np.isnan(values)
+    filled = np.where(mask, values, 0.0)
+
+    # Per-series normal equations, stacked so a single solve handles all series
+    gram = np.einsum('nk,ni,nj->kij', mask.astype(float), design, design)
+    moments = np.einsum('nk,ni->ki', filled, design)
+    coefficients = np.linalg.solve(gram, moments[:, :, None])[:, :, 0]
+
+    fitted = design @ coefficients.T
+    counts = mask.sum(axis=0)
+    means = filled.sum(axis=0) / np.maximum(counts, 1)
+    residual_ss = np.sum(np.where(mask, values - fitted, 0.0) ** 2, axis=0)
+    total_ss = np.sum(np.where(mask, values - means, 0.0) ** 2, axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        r2 = np.where(total_ss > 0, 1 - residual_ss / total_ss, np.nan)
+
+    return coefficients, r2
+
+def harmonic_components(design, values, coefficients):
+    """Split each series into trend, seasonal cycle and anomaly components"""
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 1:
+        values = values[:, None]
+    trend = design[:, :2] @ coefficients[:, :2].T
+    seasonal = design[:, 2:] @ coefficients[:, 2:].T
+    return {
+        'trend': trend,
+        'seasonal': seasonal,
+        'fitted': trend + seasonal,
+        'anomaly': values - trend - seasonal,
+    }
+
+def seasonal_harmonic_model(design, df, columns=HARMONIC_COLUMNS):
+    """Fit the harmonic model to the given columns of a daily frame aligned with design"""
+    values = df[columns].to_numpy(dtype=float)
+    coefficients, r2 = fit_harmonics(design, values)
+    components = harmonic_components(design, values, coefficients)
+    return {
+        'columns': list(columns),
+        'coefficients': pd.DataFrame(coefficients, index=columns, columns=DESIGN_COLUMNS),
+        # The trend coefficient is per year because design time is in years
+        'slope_per_year': pd.Series(coefficients[:, 1], index=columns),
+        'r2': pd.Series(r2, index=columns),
+        'components': {
+            name: pd.DataFrame(component, index=df.index, columns=columns)
+            for name, component in components.items()
+        },
+    }
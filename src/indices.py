@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+from scipy.special import gammainc, ndtri
+
+# Degree-day base temperatures (°C); 17°C is the Norwegian heating standard
+HEATING_BASE = 17.0
+COOLING_BASE = 22.0
+
+# A day with at least this much precipitation counts as wet (mm)
+WET_DAY_MM = 1.0
+
+# Months accumulated for the standardized precipitation index
+SPI_MONTHS = 3
+
+def _station_codes(df):
+    """Integer station codes, or a single station when the frame has no station column"""
+    if 'station' in df.columns:
+        codes, stations = pd.factorize(df['station'], sort=True)
+        return codes, np.asarray(stations)
+    return np.zeros(len(df), dtype=int), np.array([None])
+
+def _longest_runs(group, state, times, n_groups):
+    """Longest run of consecutive True and False days of state within each group.
+
+    Rows must be sorted by group and time. Runs break when the state flips,
+    the group changes or a date is missing.
+    """
+    if len(state) == 0:
+        return np.zeros(n_groups, dtype=int), np.zeros(n_groups, dtype=int)
+
+    gap = np.diff(times) != np.timedelta64(1, 'D')
+    starts = np.concatenate([[True], (np.diff(state) != 0) | (np.diff(group) != 0) | gap])
+
+    run_id = np.cumsum(starts) - 1
+    run_lengths = np.bincount(run_id)
+    run_group = group[starts]
+    run_state = state[starts]
+
+    longest_true = np.zeros(n_groups, dtype=int)
+    longest_false = np.zeros(n_groups, dtype=int)
+    np.maximum.at(longest_true, run_group[run_state], run_lengths[run_state])
+    np.maximum.at(longest_false, run_group[~run_state], run_lengths[~run_state])
+    return longest_true, longest_false
+
+def annual_indices(df, heating_base=HEATING_BASE, cooling_base=COOLING_BASE, wet_day_mm=WET_DAY_MM):
+    """Degree days and longest dry/wet spells per station and year, in one pass over the daily rows"""
+    codes, stations = _station_codes(df)
+    times = pd.to_datetime(df['time']).to_numpy()
+    years = df['year'].to_numpy()
+
+    # Sort rows by station and date so runs are contiguous
+    order = np.lexsort((times, codes))
+    codes, times, years = codes[order], times[order], years[order]
+    temperature = df['temperature_avg'].to_numpy(dtype=float)[order]
+    rain = df['precipitation_sum'].to_numpy(dtype=float)[order]
+
+    first_year = years.min()
+    n_years = years.max() - first_year + 1
+    group = codes * n_years + (years - first_year)
+    n_groups = len(stations) * n_years
+
+    heating = np.bincount(group, weights=np.clip(heating_base - temperature, 0, None), minlength=n_groups)
+    cooling = np.bincount(group, weights=np.clip(temperature - cooling_base, 0, None), minlength=n_groups)
+    days = np.bincount(group, minlength=n_groups)
+    wet_spell, dry_spell = _longest_runs(group, rain >= wet_day_mm, times, n_groups)
+
+    index = pd.MultiIndex.from_product(
+        [stations, np.arange(first_year, first_year + n_years)], names=['station', 'year']
+    )
+    indices = pd.DataFrame({
+        'heating_degree_days': heating.round(1),
+        'cooling_degree_days': cooling.round(1),
+        'longest_dry_spell': dry_spell,
+        'longest_wet_spell': wet_spell,
+    }, index=index)[days > 0]
+
+    if 'station' not in df.columns:
+        indices = indices.droplevel('station')
+    return indices
+
+def standardized_precipitation_index(df, months=SPI_MONTHS):
+    """Monthly standardized precipitation index (SPI) per station.
+
+    Precipitation is accumulated over a rolling window of months, a gamma
+    distribution with a point mass at zero is fitted per station and calendar
+    month, and the cumulative probabilities are mapped to standard normal scores.
+    """
+    codes, stations = _station_codes(df)
+    monthly = pd.DataFrame({
+        'station': codes,
+        'year': df['year'].to_numpy(),
+        'month': df['month'].to_numpy(),
+        'precipitation': df['precipitation_sum'].to_numpy(dtype=float),
+    }).groupby(['station', 'year', 'month'], sort=True)['precipitation'].sum().reset_index()
+
+    # Rolling sums over consecutive months, restarted at every station
+    cumulative = monthly.groupby('station')['precipitation'].cumsum().to_numpy()
+    position = monthly.groupby('station').cumcount().to_numpy()
+    shifted = np.concatenate([np.zeros(months), cumulative[:-months]]) if len(cumulative) > months else np.zeros(len(cumulative))
+    lagged = np.where(position >= months, shifted, 0.0)
+    totals = np.where(position >= months - 1, cumulative - lagged, np.nan)
+
+    # Fit parameters per (station, calendar month) with Thom's maximum likelihood approximation
+    fit_group = monthly['station'].to_numpy() * 12 + monthly['month'].to_numpy() - 1
+    n_fit = len(stations) * 12
+    valid = ~np.isnan(totals)
+    positive = valid & (totals > 0)
+
+    n_valid = np.bincount(fit_group[valid], minlength=n_fit)
+    n_positive = np.bincount(fit_group[positive], minlength=n_fit)
+    sum_positive = np.bincount(fit_group[positive], weights=totals[positive], minlength=n_fit)
+    sum_log = np.bincount(fit_group[positive], weights=np.log(totals[positive]), minlength=n_fit)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = sum_positive / n_positive
+        a = np.log(mean) - sum_log / n_positive
+        alpha = (1 + np.sqrt(1 + 4 * a / 3)) / (4 * a)
+        beta = mean / alpha
+        zero_probability = 1 - n_positive / n_valid
+
+        x = np.where(positive, totals, 0.0)
+        probability = zero_probability[fit_group] + (1 - zero_probability[fit_group]) * np.where(
+            positive, gammainc(alpha[fit_group], x / beta[fit_group]), 0.0
+        )
+
+    # Keep scores finite at the extremes of the fitted distribution
+    probability = np.clip(probability, 1e-6, 1 - 1e-6)
+    spi = np.where(valid, ndtri(probability), np.nan)
+
+    result = pd.DataFrame({
+        'year': monthly['year'],
+        'month': monthly['month'],
+        'precipitation': monthly['precipitation'].round(1),
+        f'precipitation_{months}m': np.round(totals, 1),
+        'spi': np.round(spi, 2),
+    })
+    if 'station' in df.columns:
+        result.insert(0, 'station', stations[monthly['station'].to_numpy()])
+    return result
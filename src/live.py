@@ -0,0 +1,322 @@
+import argparse
+import io
+import os
+import threading
+import numpy as np
+import pandas as pd
+from src.validation import (
+    MEASUREMENT_COLUMNS, QUARANTINE_DIR, validate_batch, write_quarantine, format_report, missing_date_report
+)
+from src.fetch_data import latitude, longitude, fetch_recent_hourly
+from src.stations import discover_stations
+
+# Observations newer than the archive are appended to one log per station
+LIVE_DIR = os.environ.get("CLIMATE_LIVE_DIR", "data/live")
+LOG_COLUMNS = ['time', 'resolution'] + MEASUREMENT_COLUMNS
+
+SEASONS = {
+    12: 'Winter', 1: 'Winter', 2: 'Winter',
+    3: 'Spring', 4: 'Spring', 5: 'Spring',
+    6: 'Summer', 7: 'Summer', 8: 'Summer',
+    9: 'Autumn', 10: 'Autumn', 11: 'Autumn'
+}
+
+def live_log_path(station, live_dir=LIVE_DIR):
+    """Path of a station's append-only observation log"""
+    return os.path.join(live_dir, f"{station}_observations.csv")
+
+def season_of(year, month):
+    """(season year, season) of a month; December belongs to the following winter"""
+    return (year + 1 if month == 12 else year, SEASONS[month])
+
+def season_months(season_year, season):
+    """(year, month) keys making up a season"""
+    return [(season_year - 1 if month == 12 else season_year, month)
+            for month, name in SEASONS.items() if name == season]
+
+def normalize_observations(rows):
+    """Split new observations into daily and hourly log rows.
+
+    Daily rows carry temperature_2m_max, temperature_2m_min and precipitation_sum;
+    hourly rows carry temperature_2m and precipitation. An hourly row is stored as a
+    partial day whose max and min are both its temperature.
+    """
+    batch = pd.DataFrame(rows)
+    if 'time' not in batch.columns:
+        raise ValueError("observations need a 'time' column")
+
+    hourly_columns = [column for column in ('temperature_2m', 'precipitation') if column in batch.columns]
+    if not hourly_columns and not any(column in batch.columns for column in MEASUREMENT_COLUMNS):
+        raise ValueError(f"observations need daily ({', '.join(MEASUREMENT_COLUMNS)}) "
+                         "or hourly (temperature_2m, precipitation) values")
+
+    is_hourly = batch[hourly_columns].notna().any(axis=1) if hourly_columns else pd.Series(False, index=batch.index)
+
+    daily = batch[~is_hourly].reindex(columns=['time'] + MEASUREMENT_COLUMNS)
+    daily.insert(1, 'resolution', 'daily')
+
+    hourly_values = batch[is_hourly].reindex(columns=['time', 'temperature_2m', 'precipitation'])
+    hourly = pd.DataFrame({
+        'time': hourly_values['time'],
+        'resolution': 'hourly',
+        'temperature_2m_max': hourly_values['temperature_2m'],
+        'temperature_2m_min': hourly_values['temperature_2m'],
+        'precipitation_sum': hourly_values['precipitation'],
+    })
+    return daily, hourly
+
+def append_observations(rows, station, archive_dates, log_path=None, quarantine_dir=QUARANTINE_DIR):
+    """Validate new daily or hourly observations and append the accepted ones to the live log.
+
+    Days already in the archive are quarantined. Days already in the log are revised:
+    a daily row replaces the day, hourly rows add or replace hours. Returns the
+    validation reports of the daily and hourly rows, the dates missing from the
+    archive, the log and the accepted rows together, and the number of rows appended.
+    """
+    log_path = log_path or live_log_path(station)
+    result = {'appended': 0}
+    accepted = []
+
+    for resolution, batch in zip(('daily', 'hourly'), normalize_observations(rows)):
+        if batch.empty:
+            continue
+        clean, quarantine, report = validate_batch(batch, existing_dates=archive_dates)
+        write_quarantine(quarantine, station, quarantine_dir)
+        accepted.append(clean)
+        # Gaps are only meaningful over daily and hourly rows together, reported below
+        del report['missing_dates'], report['first_missing_dates']
+        result[resolution] = report
+
+    log_rows = pd.concat(accepted) if accepted else pd.DataFrame(columns=LOG_COLUMNS)
+
+    # Days already in the log close gaps after the archive as much as new rows do
+    times = pd.to_datetime(log_rows['time'], format='ISO8601')
+    if os.path.exists(log_path):
+        times = pd.concat([pd.to_datetime(pd.read_csv(log_path, usecols=['time'])['time'], format='ISO8601'), times])
+    result.update(missing_date_report(times, existing_dates=archive_dates))
+
+    if not log_rows.empty:
+        log_rows = log_rows.assign(time=pd.to_datetime(log_rows['time'], format='ISO8601').dt.strftime('%Y-%m-%dT%H:%M'))
+        os.makedirs(os.path.dirname(log_path) or ".", exist_ok=True)
+        text = log_rows.to_csv(index=False, header=not os.path.exists(log_path), columns=LOG_COLUMNS)
+        # A single write, so a reader never sees part of a row
+        with open(log_path, "a") as f:
+            f.write(text)
+        result['appended'] = len(log_rows)
+
+    return result
+
+def merge_summaries(summaries):
+    """Combine period summaries; None entries are skipped"""
+    summaries = [summary for summary in summaries if summary is not None]
+    if not summaries:
+        return None
+
+    merged = {key: sum(summary[key] for summary in summaries)
+              for key in ('days', 'temp_days', 'temp_sum', 'rain_sum')}
+    for key, pick in (('max_temp', max), ('min_temp', min), ('max_rain', max)):
+        candidates = [summary for summary in summaries if not np.isnan(summary[key])]
+        best = pick(candidates, key=lambda summary: summary[key]) if candidates else None
+        merged[key] = best[key] if best else np.nan
+        merged[f'{key}_date'] = best[f'{key}_date'] if best else None
+    return merged
+
+def period_stats(summary):
+    """Display statistics of a period summary"""
+    if summary is None:
+        return {'days': 0, 'avg_temp': np.nan, 'total_rain': np.nan, 'max_temp': np.nan,
+                'max_temp_date': None, 'min_temp': np.nan, 'min_temp_date': None,
+                'max_rain': np.nan, 'max_rain_date': None}
+    return {
+        'days': summary['days'],
+        'avg_temp': summary['temp_sum'] / summary['temp_days'] if summary['temp_days'] else np.nan,
+        'total_rain': summary['rain_sum'],
+        'max_temp': summary['max_temp'],
+        'max_temp_date': summary['max_temp_date'],
+        'min_temp': summary['min_temp'],
+        'min_temp_date': summary['min_temp_date'],
+        'max_rain': summary['max_rain'],
+        'max_rain_date': summary['max_rain_date'],
+    }
+
+def _month_summaries(df):
+    """Summaries of every (year, month) of a processed daily frame, in one groupby"""
+    grouped = df.groupby([df['time'].dt.year, df['time'].dt.month])
+    stats = grouped.agg(
+        days=('time', 'size'),
+        temp_days=('temperature_avg', 'count'),
+        temp_sum=('temperature_avg', 'sum'),
+        rain_sum=('precipitation_sum', 'sum'),
+        max_temp=('temperature_2m_max', 'max'),
+        min_temp=('temperature_2m_min', 'min'),
+        max_rain=('precipitation_sum', 'max'),
+    )
+    stats['max_temp_date'] = df.loc[grouped['temperature_2m_max'].idxmax(), 'time'].to_numpy()
+    stats['min_temp_date'] = df.loc[grouped['temperature_2m_min'].idxmin(), 'time'].to_numpy()
+    stats['max_rain_date'] = df.loc[grouped['precipitation_sum'].idxmax(), 'time'].to_numpy()
+    return {(int(year), int(month)): dict(row, max_temp_date=pd.Timestamp(row['max_temp_date']),
+                                          min_temp_date=pd.Timestamp(row['min_temp_date']),
+                                          max_rain_date=pd.Timestamp(row['max_rain_date']))
+            for (year, month), row in stats.to_dict('index').items()}
+
+def _day_summary(date, max_temp, min_temp, rain):
+    avg_temp = (max_temp + min_temp) / 2
+    return {
+        'days': 1,
+        'temp_days': 0 if np.isnan(avg_temp) else 1,
+        'temp_sum': 0.0 if np.isnan(avg_temp) else avg_temp,
+        'rain_sum': 0.0 if np.isnan(rain) else rain,
+        'max_temp': max_temp, 'max_temp_date': date,
+        'min_temp': min_temp, 'min_temp_date': date,
+        'max_rain': rain, 'max_rain_date': date,
+    }
+
+class LiveAggregates:
+    """Running month, season and year aggregates over the archive and the live log.
+
+    The archive is summarised once. Observations appended to the log are picked up
+    by refresh(), which reads only the new part of the log and recomputes only the
+    months, seasons and years the new days fall in.
+    """
+
+    def __init__(self, archive, log_path):
+        self.log_path = log_path
+        self.archive_dates = pd.DatetimeIndex(archive['time'].dt.normalize().unique())
+        self.archive_end = archive['time'].max()
+        self._base_months = _month_summaries(archive)
+        self._lock = threading.Lock()
+        self._reset_live()
+
+    def _reset_live(self):
+        self._offset = 0
+        self._daily = {}
+        self._hourly = {}
+        self._days = {}
+        self._month_days = {}
+        self.months = dict(self._base_months)
+        self.years = {}
+        self.seasons = {}
+        for year, month in self.months:
+            self._update_periods(year, month)
+
+    def refresh(self):
+        """Apply observations appended to the log since the last refresh"""
+        with self._lock:
+            try:
+                if os.path.getsize(self.log_path) < self._offset:
+                    # The log was replaced; replay it from the start
+                    self._reset_live()
+                with open(self.log_path, "rb") as f:
+                    f.seek(self._offset)
+                    chunk = f.read()
+            except OSError:
+                return
+
+            # A row still being written is picked up by the next refresh
+            end = chunk.rfind(b"\n") + 1
+            if end == 0:
+                return
+            rows = pd.read_csv(io.StringIO(chunk[:end].decode()), names=LOG_COLUMNS,
+                               header=0 if self._offset == 0 else None)
+            self._offset += end
+            self._apply(rows)
+
+    def _apply(self, rows):
+        times = pd.to_datetime(rows['time'], errors='coerce')
+        # The archive is authoritative for the days it covers
+        keep = times.notna() & ~times.dt.normalize().isin(self.archive_dates)
+        rows, times = rows[keep], times[keep]
+
+        values = rows[MEASUREMENT_COLUMNS].to_numpy(dtype=float)
+        for time, resolution, day_values in zip(times, rows['resolution'], values):
+            date = time.normalize()
+            if resolution == 'daily':
+                self._daily[date] = day_values
+            else:
+                self._hourly.setdefault(date, {})[time] = day_values
+
+        for date in set(times.dt.normalize()):
+            self._days[date] = self._day(date)
+            self._month_days.setdefault((date.year, date.month), set()).add(date)
+
+        for year, month in {(date.year, date.month) for date in times.dt.normalize()}:
+            self.months[(year, month)] = merge_summaries(
+                [self._base_months.get((year, month))] + [self._days[date] for date in self._month_days[(year, month)]]
+            )
+            self._update_periods(year, month)
+
+    def _day(self, date):
+        """Summary of one live day; a daily row takes precedence over hourly rows"""
+        if date in self._daily:
+            max_temp, min_temp, rain = self._daily[date]
+        else:
+            hours = np.array(list(self._hourly[date].values()))
+            max_temp, min_temp = np.fmax.reduce(hours[:, 0]), np.fmin.reduce(hours[:, 1])
+            rain = np.nansum(hours[:, 2]) if np.any(~np.isnan(hours[:, 2])) else np.nan
+        return _day_summary(date, max_temp, min_temp, rain)
+
+    def _update_periods(self, year, month):
+        """Recompute the year and season containing a month from its month summaries"""
+        self.years[year] = merge_summaries(self.months.get((year, m)) for m in range(1, 13))
+        season_key = season_of(year, month)
+        self.seasons[season_key] = merge_summaries(self.months.get(key) for key in season_months(*season_key))
+
+    def range_stats(self, year_range):
+        """Statistics over a year range, merged from the year summaries"""
+        with self._lock:
+            years = [self.years.get(year) for year in range(year_range[0], year_range[1] + 1)]
+            return period_stats(merge_summaries(years))
+
+    def live_through(self):
+        """Latest day received through the live log, or None"""
+        with self._lock:
+            return max(self._days) if self._days else None
+
+    def current_periods(self):
+        """Statistics of the month, season and year of the latest day"""
+        with self._lock:
+            latest = max(self._days) if self._days else self.archive_end
+            season_key = season_of(latest.year, latest.month)
+            return {
+                'month': dict(period_stats(self.months.get((latest.year, latest.month))), label=latest.strftime('%B %Y')),
+                'season': dict(period_stats(self.seasons.get(season_key)), label=f"{season_key[1]} {season_key[0]}"),
+                'year': dict(period_stats(self.years.get(latest.year)), label=str(latest.year)),
+            }
+
+    def live_days(self):
+        """Daily values of the days received through the live log"""
+        with self._lock:
+            days = sorted(self._days)
+            return pd.DataFrame({
+                'time': days,
+                'temperature_2m_max': [self._days[date]['max_temp'] for date in days],
+                'temperature_2m_min': [self._days[date]['min_temp'] for date in days],
+                # A single day's maximum is its value, NaN when nothing was reported
+                'precipitation_sum': [self._days[date]['max_rain'] for date in days],
+                'hours': [0 if date in self._daily else len(self._hourly[date]) for date in days],
+            })
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Append recent hourly observations to the live log")
+    parser.add_argument("--past-days", type=int, default=1, help="Days of history to request")
+    args = parser.parse_args(argv)
+
+    station = "bergen"
+    archive = pd.read_csv(discover_stations()[station], usecols=['time'])
+    log_path = live_log_path(station)
+
+    hourly = fetch_recent_hourly(latitude, longitude, args.past_days)
+    if os.path.exists(log_path):
+        # Only hours newer than the log; earlier ones were sent by a previous run
+        logged = pd.to_datetime(pd.read_csv(log_path, usecols=['time'])['time'])
+        if len(logged):
+            hourly = hourly[pd.to_datetime(hourly['time']) > logged.max()]
+
+    result = append_observations(hourly, station, pd.to_datetime(archive['time']), log_path)
+    if 'hourly' in result:
+        print(format_report({**result['hourly'], 'missing_dates': result['missing_dates'],
+                             'first_missing_dates': result['first_missing_dates']}))
+    print(f"Appended {result['appended']} rows to {log_path}")
+
+if __name__ == "__main__":
+    main()
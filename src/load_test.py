@@ -0,0 +1,170 @@
+"""Offline load test for the dashboard pages.
+
+Runs N concurrent simulated sessions against the pages in statistics/ and
+analysis/ with Streamlit's AppTest, randomizing slider values between reruns,
+and reports rerun latency percentiles, throughput and the peak RSS growth of
+each session's process.
+
+Each session runs in a fresh process of its own, because AppTest installs a
+process-wide mock runtime for every run and sessions cannot share one
+interpreter safely. Sessions therefore never share st.cache_data entries, the
+GIL or memory: every session pays its own imports and cold caches. The report
+measures isolated-process sessions running side by side on one machine; it does
+not measure how many simultaneous users a single `streamlit run` worker can
+serve, where sessions would share caches and contend for one interpreter.
+Everything runs offline against synthetic data in a temporary directory.
+
+Usage:
+    python -m src.load_test --sessions 8 --reruns 5
+"""
+import argparse
+import glob
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_PAGES = ['statistics/*.py', 'analysis/*.py']
+
+def synthetic_climate_data(start_year=2000, end_year=2024, seed=0):
+    """Generate daily climate data with a seasonal cycle, a warming trend and wet/dry days"""
+    rng = np.random.default_rng(seed)
+    time_index = pd.date_range(f"{start_year}-01-01", f"{end_year}-12-31", freq="D")
+    t = np.arange(len(time_index)) / 365.25
+
+    seasonal = 8 + 6 * np.sin(2 * np.pi * (t - 0.3)) + 0.03 * t
+    temperature_avg = seasonal + rng.normal(0, 2, len(t))
+    half_range = rng.uniform(1.5, 4.5, len(t))
+
+    wet = rng.random(len(t)) < 0.6
+    precipitation = np.where(wet, rng.gamma(0.8, 8, len(t)), 0.0)
+
+    return pd.DataFrame({
+        'time': time_index.strftime('%Y-%m-%d'),
+        'temperature_2m_max': (temperature_avg + half_range).round(1),
+        'temperature_2m_min': (temperature_avg - half_range).round(1),
+        'precipitation_sum': precipitation.round(1),
+        'temperature_avg': temperature_avg.round(2),
+    })
+
+def write_synthetic_dataset(directory, stations=1, start_year=2000, end_year=2024):
+    """Write synthetic station files into directory/data; the first station is the default one"""
+    data_dir = os.path.join(directory, "data")
+    os.makedirs(data_dir, exist_ok=True)
+    names = ['bergen'] + [f"station_{i:03d}" for i in range(1, stations)]
+    for seed, name in enumerate(names):
+        df = synthetic_climate_data(start_year, end_year, seed=seed)
+        df.to_csv(os.path.join(data_dir, f"{name}_climate_data.csv"), index=False)
+
+def _randomize_sliders(app, rng):
+    """Pick random values for every slider on the page (ranges stay ordered)"""
+    for slider in list(app.sidebar.slider) + list(app.main.slider):
+        low, high = slider.min, slider.max
+        if isinstance(slider.value, (list, tuple)):
+            slider.set_range(*sorted(rng.randint(low, high) for _ in range(2)))
+        else:
+            slider.set_value(rng.randint(low, high))
+
+def run_session(session_id, pages, reruns, timeout, seed, workdir):
+    """Simulate one user session in its own process: open each page, then rerun it with random slider values"""
+    # Pages import from src/ and read data/ relative to the working directory
+    sys.path.insert(0, REPO_ROOT)
+    os.chdir(workdir)
+    from streamlit.testing.v1 import AppTest
+
+    rss_before = _max_rss_mb()
+    rng = random.Random(seed + session_id)
+    timings = []
+    errors = []
+
+    for page in rng.sample(pages, len(pages)):
+        app = AppTest.from_file(page, default_timeout=timeout)
+        for rerun in range(reruns + 1):
+            if rerun > 0:
+                _randomize_sliders(app, rng)
+            started = time.perf_counter()
+            app.run()
+            timings.append((os.path.relpath(page, REPO_ROOT), time.perf_counter() - started))
+            errors.extend(f"{os.path.relpath(page, REPO_ROOT)}: {e.value}" for e in app.exception)
+
+    return timings, errors, _max_rss_mb() - rss_before
+
+def _max_rss_mb():
+    """Peak resident set size of this process in MB (Linux reports KB, macOS bytes)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def format_report(timings, errors, memory, elapsed):
+    """Summarise latencies per page and overall; memory is the peak RSS growth of each session's process"""
+    frame = pd.DataFrame(timings, columns=['page', 'seconds'])
+    percentiles = [50, 90, 95, 99]
+
+    def summarize(seconds):
+        values = np.percentile(seconds, percentiles) * 1000
+        return pd.Series(
+            [len(seconds), seconds.mean() * 1000, *values],
+            index=['reruns', 'mean ms'] + [f"p{p} ms" for p in percentiles]
+        )
+
+    per_page = frame.groupby('page')['seconds'].apply(summarize).unstack()
+    per_page.loc['ALL'] = summarize(frame['seconds'])
+
+    lines = [
+        per_page.round(1).to_string(),
+        "",
+        f"Isolated-process sessions: {len(memory)}",
+        f"Wall time:                 {elapsed:.1f} s",
+        f"Throughput:                {len(frame) / elapsed:.2f} reruns/s",
+        f"Per-process RSS growth:    mean {np.mean(memory):.1f} MB, max {np.max(memory):.1f} MB "
+        "(page imports and that process's own caches)",
+        f"Errors:                    {len(errors)}",
+        "Sessions do not share caches or an interpreter; cross-session cache reuse is not measured.",
+    ]
+    lines.extend(f"  {error}" for error in errors[:10])
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the dashboard pages with concurrent isolated-process sessions")
+    parser.add_argument("--sessions", type=int, default=8, help="Number of concurrent sessions, one process each")
+    parser.add_argument("--reruns", type=int, default=5, help="Reruns with random slider values per page and session")
+    parser.add_argument("--pages", nargs="*", default=DEFAULT_PAGES, help="Page scripts or globs, relative to the repository")
+    parser.add_argument("--stations", type=int, default=1, help="Number of synthetic stations")
+    parser.add_argument("--years", type=int, nargs=2, default=(2000, 2024), metavar=("START", "END"), help="Synthetic year range")
+    parser.add_argument("--timeout", type=float, default=120, help="Per-rerun timeout in seconds")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for slider values")
+    args = parser.parse_args(argv)
+
+    pages = sorted({
+        path for pattern in args.pages
+        for path in glob.glob(os.path.join(REPO_ROOT, pattern))
+    })
+    if not pages:
+        parser.error("no pages matched")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        write_synthetic_dataset(workdir, args.stations, *args.years)
+        started = time.perf_counter()
+        # One fresh process per session, so no process runs two sessions and reports ~0 MB for the second
+        with ProcessPoolExecutor(max_workers=args.sessions, max_tasks_per_child=1) as pool:
+            futures = [
+                pool.submit(run_session, session_id, pages, args.reruns, args.timeout, args.seed, workdir)
+                for session_id in range(args.sessions)
+            ]
+            results = [future.result() for future in futures]
+        elapsed = time.perf_counter() - started
+
+    timings = [timing for session_timings, _, _ in results for timing in session_timings]
+    errors = [error for _, session_errors, _ in results for error in session_errors]
+    memory = [session_memory for _, _, session_memory in results]
+    print(format_report(timings, errors, memory, elapsed))
+    return 1 if errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
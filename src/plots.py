@@ -1,11 +1,15 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from src.stations import station_label
+from src.forecast import prediction_intervals
 
-def plot_temperature_trends(df):
-    """Create an interactive temperature trends plot"""
+@st.cache_data(show_spinner=False)
+def temperature_trends_figure(df):
+    """Build the temperature trends figure (cached per data slice)"""
     
     # Create subplot for better visualization
     fig = go.Figure()
@@ -49,10 +53,77 @@ def plot_temperature_trends(df):
         legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
-def plot_rainfall_trends(df):
-    """Create an interactive rainfall plot"""
+def plot_temperature_trends(df):
+    """Create an interactive temperature trends plot"""
+    st.plotly_chart(temperature_trends_figure(df), use_container_width=True)
+
+def calendar_array(df, column):
+    """Scatter a daily column into a (year x day-of-year) array with aligned leap days"""
+    times = pd.to_datetime(df['time'])
+    years = times.dt.year.to_numpy()
+    day_index = times.dt.dayofyear.to_numpy() - 1
+    
+    # Shift non-leap days after Feb 28 by one slot so every date has a fixed column
+    day_index = day_index + ((~times.dt.is_leap_year.to_numpy()) & (day_index >= 59))
+    
+    first_year = years.min()
+    grid = np.full((years.max() - first_year + 1, 366), np.nan)
+    grid[years - first_year, day_index] = df[column].to_numpy(dtype=float)
+    
+    return grid, np.arange(first_year, years.max() + 1)
+
+@st.cache_data(show_spinner=False)
+def calendar_heatmap_figure(df, metric="Temperature"):
+    """Build the calendar heatmap figure (cached per data slice and metric)"""
+    
+    column = 'precipitation_sum' if metric == "Precipitation" else 'temperature_avg'
+    grid, years = calendar_array(df, column)
+    
+    if metric == "Anomaly":
+        # Departure from the day-of-year mean over the selected years
+        counts = np.sum(~np.isnan(grid), axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            climatology = np.nansum(grid, axis=0) / counts
+        grid = grid - climatology
+    
+    colorscale, unit, zmid = {
+        "Temperature": ('RdBu_r', '°C', None),
+        "Anomaly": ('RdBu_r', '°C', 0),
+        "Precipitation": ('Blues', 'mm', None),
+    }[metric]
+    
+    # Day columns labelled with dates from a leap year so Feb 29 has a slot
+    days = pd.date_range("2000-01-01", periods=366, freq="D")
+    
+    fig = go.Figure(go.Heatmap(
+        z=grid,
+        x=days,
+        y=years,
+        colorscale=colorscale,
+        zmid=zmid,
+        colorbar=dict(title=unit),
+        hoverongaps=False,
+        hovertemplate=f'<b>%{{y}} %{{x|%b %d}}</b><br>{metric}: %{{z:.1f}}{unit}<extra></extra>'
+    ))
+    
+    fig.update_layout(
+        title=f"Daily {metric} Calendar",
+        xaxis=dict(title="Day of Year", tickformat='%b'),
+        yaxis=dict(title="Year", autorange='reversed', dtick=1),
+        height=max(300, 40 * len(years) + 150)
+    )
+    
+    return fig
+
+def plot_calendar_heatmap(df, metric="Temperature"):
+    """Create a year x day-of-year heatmap of temperature, temperature anomaly or rainfall"""
+    st.plotly_chart(calendar_heatmap_figure(df, metric), use_container_width=True)
+
+@st.cache_data(show_spinner=False)
+def rainfall_figures(df):
+    """Build the monthly and daily rainfall figures (cached per data slice)"""
     
     # Create monthly aggregation for better visualization
     df_monthly = df.copy()
@@ -84,26 +155,35 @@ def plot_rainfall_trends(df):
         hovertemplate='<b>Monthly Rainfall</b><br>Date: %{x}<br>Precipitation: %{y:.1f}mm<extra></extra>'
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    # Daily rainfall
+    daily_fig = px.line(
+        df, 
+        x='time', 
+        y='precipitation_sum',
+        title="Daily Rainfall",
+        labels={
+            'time': 'Date',
+            'precipitation_sum': 'Daily Precipitation (mm)'
+        },
+        color_discrete_sequence=['#1f77b4']
+    )
+    daily_fig.update_layout(height=400)
+    
+    return fig, daily_fig
+
+def plot_rainfall_trends(df):
+    """Create an interactive rainfall plot"""
+    monthly_fig, daily_fig = rainfall_figures(df)
+    
+    st.plotly_chart(monthly_fig, use_container_width=True)
     
     # Add daily rainfall as well in an expander
     with st.expander("View Daily Rainfall Data"):
-        daily_fig = px.line(
-            df, 
-            x='time', 
-            y='precipitation_sum',
-            title="Daily Rainfall",
-            labels={
-                'time': 'Date',
-                'precipitation_sum': 'Daily Precipitation (mm)'
-            },
-            color_discrete_sequence=['#1f77b4']
-        )
-        daily_fig.update_layout(height=400)
         st.plotly_chart(daily_fig, use_container_width=True)
 
-def plot_annual_averages(df):
-    """Create annual summary visualizations"""
+@st.cache_data(show_spinner=False)
+def annual_average_figures(df):
+    """Build the annual temperature and precipitation figures and summary table (cached per data slice)"""
     
     # Calculate annual statistics
     annual = df.groupby("year").agg({
@@ -115,53 +195,41 @@ def plot_annual_averages(df):
     
     annual.reset_index(inplace=True)
     
-    # Create subplots
-    col1, col2 = st.columns(2)
+    # Temperature trends
+    temp_fig = go.Figure()
     
-    with col1:
-        # Temperature trends
-        temp_fig = go.Figure()
-        
-        temp_fig.add_trace(go.Scatter(
-            x=annual['year'],
-            y=annual['temperature_avg'],
-            mode='lines+markers',
-            name='Average Temperature',
-            line=dict(color='#ff6b6b', width=3),
-            marker=dict(size=8)
-        ))
-        
-        temp_fig.update_layout(
-            title="Annual Average Temperature",
-            xaxis_title="Year",
-            yaxis_title="Temperature (°C)",
-            height=400
-        )
-        
-        st.plotly_chart(temp_fig, use_container_width=True)
+    temp_fig.add_trace(go.Scatter(
+        x=annual['year'],
+        y=annual['temperature_avg'],
+        mode='lines+markers',
+        name='Average Temperature',
+        line=dict(color='#ff6b6b', width=3),
+        marker=dict(size=8)
+    ))
     
-    with col2:
-        # Precipitation trends
-        precip_fig = go.Figure()
-        
-        precip_fig.add_trace(go.Bar(
-            x=annual['year'],
-            y=annual['precipitation_sum'],
-            name='Annual Precipitation',
-            marker_color='#4ecdc4'
-        ))
-        
-        precip_fig.update_layout(
-            title="Annual Total Precipitation",
-            xaxis_title="Year",
-            yaxis_title="Precipitation (mm)",
-            height=400
-        )
-        
-        st.plotly_chart(precip_fig, use_container_width=True)
+    temp_fig.update_layout(
+        title="Annual Average Temperature",
+        xaxis_title="Year",
+        yaxis_title="Temperature (°C)",
+        height=400
+    )
     
-    # Summary table
-    st.markdown("### 📋 Annual Climate Summary Table")
+    # Precipitation trends
+    precip_fig = go.Figure()
+    
+    precip_fig.add_trace(go.Bar(
+        x=annual['year'],
+        y=annual['precipitation_sum'],
+        name='Annual Precipitation',
+        marker_color='#4ecdc4'
+    ))
+    
+    precip_fig.update_layout(
+        title="Annual Total Precipitation",
+        xaxis_title="Year",
+        yaxis_title="Precipitation (mm)",
+        height=400
+    )
     
     # Rename columns for better display
     display_annual = annual.rename(columns={
@@ -172,8 +240,247 @@ def plot_annual_averages(df):
         'precipitation_sum': 'Total Rain (mm)'
     })
     
+    return temp_fig, precip_fig, display_annual
+
+def plot_annual_averages(df):
+    """Create annual summary visualizations"""
+    temp_fig, precip_fig, display_annual = annual_average_figures(df)
+    
+    # Create subplots
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.plotly_chart(temp_fig, use_container_width=True)
+    
+    with col2:
+        st.plotly_chart(precip_fig, use_container_width=True)
+    
+    # Summary table
+    st.markdown("### 📋 Annual Climate Summary Table")
+    
     st.dataframe(
         display_annual, 
         use_container_width=True,
         hide_index=True
     )
+
+@st.cache_data(show_spinner=False)
+def forecast_figure(yearly, forecast_years, confidence_level, regime_segments=None):
+    """Build the temperature and precipitation forecast figure with prediction intervals (cached per series)"""
+    
+    future_years = np.arange(yearly['year'].max() + 1, yearly['year'].max() + forecast_years + 1)
+    all_years = np.concatenate([yearly['year'].to_numpy(), future_years])
+    
+    fig = make_subplots(
+        rows=2, cols=1,
+        subplot_titles=('🌡️ Temperature Forecast', '🌧️ Precipitation Forecast'),
+        vertical_spacing=0.1
+    )
+    
+    for row, column, name, color, fill in [
+        (1, 'temperature_avg', 'Temperature', '#ff6b6b', 'rgba(255,107,107,0.2)'),
+        (2, 'precipitation_sum', 'Precipitation', '#4ecdc4', 'rgba(78,205,196,0.2)')
+    ]:
+        interval = prediction_intervals(
+            yearly['year'].to_numpy(), yearly[column].to_numpy(), forecast_years, confidence_level
+        )
+        
+        fig.add_trace(
+            go.Scatter(x=yearly['year'], y=yearly[column],
+                       mode='markers+lines', name=f'Historical {name}',
+                       line=dict(color=color, width=2),
+                       marker=dict(size=6)), row=row, col=1
+        )
+        
+        fig.add_trace(
+            go.Scatter(x=future_years, y=interval['forecast'][len(yearly):],
+                       mode='lines', name=f'{name} Forecast',
+                       line=dict(color=color, width=2, dash='dash')), row=row, col=1
+        )
+        
+        # Prediction interval band
+        fig.add_trace(
+            go.Scatter(x=all_years, y=interval['upper'],
+                       mode='lines', line=dict(width=0), showlegend=False), row=row, col=1
+        )
+        fig.add_trace(
+            go.Scatter(x=all_years, y=interval['lower'],
+                       mode='lines', line=dict(width=0),
+                       fill='tonexty', fillcolor=fill,
+                       name=f'{confidence_level}% Prediction Interval'), row=row, col=1
+        )
+    
+    # Regime shifts: one horizontal line per detected segment
+    if regime_segments is not None:
+        for row, column in [(1, 'temperature_avg'), (2, 'precipitation_sum')]:
+            for i, segment in regime_segments[column].iterrows():
+                fig.add_trace(
+                    go.Scatter(x=[segment['start'] - 0.5, segment['end'] + 0.5], y=[segment['mean'], segment['mean']],
+                               mode='lines', name='Regime Mean',
+                               line=dict(color='#555555', width=2, dash='dot'),
+                               legendgroup='regimes', showlegend=(row == 1 and i == 0)), row=row, col=1
+                )
+    
+    fig.update_layout(height=700, hovermode='x unified', showlegend=True)
+    fig.update_yaxes(title_text="Temperature (°C)", row=1, col=1)
+    fig.update_yaxes(title_text="Precipitation (mm)", row=2, col=1)
+    
+    return fig
+
+def plot_harmonic_decomposition(df, components, column, unit):
+    """Plot observed values with the fitted trend, seasonal cycle and anomalies"""
+    
+    fig = make_subplots(
+        rows=3, cols=1,
+        shared_xaxes=True,
+        subplot_titles=('Observed & Fitted', 'Seasonal Cycle', 'Anomaly'),
+        vertical_spacing=0.08
+    )
+    
+    fig.add_trace(go.Scattergl(
+        x=df['time'],
+        y=df[column],
+        mode='markers',
+        name='Observed',
+        marker=dict(color='#b0b0b0', size=3)
+    ), row=1, col=1)
+    
+    fig.add_trace(go.Scattergl(
+        x=df['time'],
+        y=components['fitted'][column],
+        mode='lines',
+        name='Trend + Seasonal Fit',
+        line=dict(color='#45b7d1', width=2)
+    ), row=1, col=1)
+    
+    fig.add_trace(go.Scattergl(
+        x=df['time'],
+        y=components['trend'][column],
+        mode='lines',
+        name='Trend',
+        line=dict(color='#ff6b6b', width=2, dash='dash')
+    ), row=1, col=1)
+    
+    fig.add_trace(go.Scattergl(
+        x=df['time'],
+        y=components['seasonal'][column],
+        mode='lines',
+        name='Seasonal Cycle',
+        line=dict(color='#4ecdc4', width=2)
+    ), row=2, col=1)
+    
+    fig.add_trace(go.Scattergl(
+        x=df['time'],
+        y=components['anomaly'][column],
+        mode='lines',
+        name='Anomaly',
+        line=dict(color='#7f7f7f', width=1)
+    ), row=3, col=1)
+    
+    fig.update_layout(height=750, hovermode='x unified', showlegend=True)
+    fig.update_yaxes(title_text=unit, row=1, col=1)
+    fig.update_yaxes(title_text=unit, row=2, col=1)
+    fig.update_yaxes(title_text=unit, row=3, col=1)
+    
+    st.plotly_chart(fig, use_container_width=True)
+
+def station_small_multiples_figure(cube, station_indices, year_range, metric_key, metric_label, columns=4):
+    """Build a small-multiples grid of annual series per station with shared axes"""
+    
+    years = cube['years']
+    selected = (years >= year_range[0]) & (years <= year_range[1])
+    values = cube[metric_key][:, selected]
+    stations = cube['stations']
+    
+    rows = max(1, int(np.ceil(len(station_indices) / columns)))
+    fig = make_subplots(
+        rows=rows, cols=columns,
+        # 'all' links every panel; True would only share y within a row and x within a column
+        shared_xaxes='all', shared_yaxes='all',
+        subplot_titles=[station_label(stations[i]) for i in station_indices],
+        vertical_spacing=min(0.08, 0.3 / rows),
+        horizontal_spacing=0.02
+    )
+    
+    for position, station_index in enumerate(station_indices):
+        fig.add_trace(go.Scattergl(
+            x=years[selected],
+            y=values[station_index],
+            mode='lines+markers',
+            line=dict(color='#45b7d1', width=2),
+            marker=dict(size=4),
+            showlegend=False,
+            hovertemplate=f'%{{x}}: %{{y:.1f}}<extra>{station_label(stations[station_index])}</extra>'
+        ), row=position // columns + 1, col=position % columns + 1)
+    
+    fig.update_layout(
+        title=f"Annual {metric_label} by Station",
+        height=max(300, 180 * rows + 100)
+    )
+    
+    return fig
+
+def plot_station_small_multiples(cube, station_indices, year_range, metric_key, metric_label, columns=4):
+    """Create a small-multiples grid of annual series per station with shared axes"""
+    st.plotly_chart(
+        station_small_multiples_figure(cube, station_indices, year_range, metric_key, metric_label, columns),
+        use_container_width=True
+    )
+
+def station_year_heatmap_figure(cube, year_range, metric_key, metric_label):
+    """Build a single-trace station x year heatmap covering every station"""
+    
+    years = cube['years']
+    selected = (years >= year_range[0]) & (years <= year_range[1])
+    
+    fig = go.Figure(go.Heatmap(
+        z=cube[metric_key][:, selected],
+        x=years[selected],
+        y=[station_label(station) for station in cube['stations']],
+        colorscale='RdBu_r' if metric_key.startswith('temp') else 'Blues',
+        colorbar=dict(title=metric_label),
+        hoverongaps=False
+    ))
+    
+    fig.update_layout(
+        title=f"Annual {metric_label} — All Stations",
+        xaxis=dict(title="Year", dtick=1),
+        height=max(300, 20 * len(cube['stations']) + 150)
+    )
+    
+    return fig
+
+def plot_station_year_heatmap(cube, year_range, metric_key, metric_label):
+    """Create a single-trace station x year heatmap covering every station"""
+    st.plotly_chart(station_year_heatmap_figure(cube, year_range, metric_key, metric_label), use_container_width=True)
+
+def spi_figure(spi_df, months):
+    """Build a bar chart of the monthly standardized precipitation index"""
+    
+    spi_df = spi_df.dropna(subset=['spi'])
+    dates = pd.to_datetime(dict(year=spi_df['year'], month=spi_df['month'], day=1))
+    
+    fig = go.Figure(go.Bar(
+        x=dates,
+        y=spi_df['spi'],
+        marker_color=np.where(spi_df['spi'] >= 0, '#45b7d1', '#ff6b6b'),
+        hovertemplate='<b>%{x|%b %Y}</b><br>SPI: %{y:.2f}<extra></extra>'
+    ))
+    
+    # Conventional drought / wet thresholds
+    fig.add_hline(y=-1, line=dict(color='#ff6b6b', dash='dot', width=1))
+    fig.add_hline(y=1, line=dict(color='#45b7d1', dash='dot', width=1))
+    
+    fig.update_layout(
+        title=f"{months}-Month Standardized Precipitation Index",
+        xaxis_title="Date",
+        yaxis_title="SPI",
+        height=400,
+        showlegend=False
+    )
+    
+    return fig
+
+def plot_spi(spi_df, months):
+    """Create a bar chart of the monthly standardized precipitation index"""
+    st.plotly_chart(spi_figure(spi_df, months), use_container_width=True)
@@ -0,0 +1,37 @@
+"""Start the dashboard with its cache warm-up already running.
+
+`streamlit run app.py` only executes app.py when the first session connects, so
+warm-up started from there begins with the first visitor. This entry point
+clears the previous ready file, starts the warm-up (and the aggregates API when
+CLIMATE_API_PORT is set) in this process, and only then starts the Streamlit
+server. The caches warmed here are the ones the sessions read.
+
+Usage:
+    python -m src.serve [-- <streamlit run options>]
+    python -m src.serve -- --server.port 8501
+"""
+import os
+import sys
+
+from streamlit.web import cli as stcli
+
+from src.api import start_api_server
+from src.warmup import start_warmup
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["--"]:
+        argv = argv[1:]
+
+    # Before the server accepts traffic: no stale ready file, warm-up under way
+    start_warmup()
+    if os.environ.get("CLIMATE_API_PORT"):
+        start_api_server(int(os.environ["CLIMATE_API_PORT"]))
+
+    sys.argv = ["streamlit", "run", APP_PATH, *argv]
+    return stcli.main()
+
+if __name__ == "__main__":
+    sys.exit(main())
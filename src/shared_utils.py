@@ -1,46 +1,161 @@
+import os
 import streamlit as st
 import pandas as pd
 from src.process_data import process_data
+from src.sketches import build_year_sketches
+from src.harmonics import harmonic_design_matrix
+from src.stations import discover_stations, station_year_cube
+from src.indices import annual_indices, standardized_precipitation_index
+from src.traffic import record_range_view
+from src.live import LiveAggregates, live_log_path
+
+DATA_PATH = "data/bergen_climate_data.csv"
+
+# Station name of DATA_PATH in the data folder
+DATA_STATION = "bergen"
+
+# Columns summarised by the per-year quantile sketches
+SKETCH_COLUMNS = ['temperature_2m_max', 'temperature_2m_min', 'temperature_avg', 'precipitation_sum']
+
+def file_version(path):
+    """Identify a data file by modification time and size"""
+    stat = os.stat(path)
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+def dataset_version():
+    """Identify the current dataset by file modification time and size"""
+    return file_version(DATA_PATH)
 
 @st.cache_data
+def _load_data(version):
+    df = pd.read_csv(DATA_PATH)
+    return process_data(df)
+
 def load_data():
     """Load and process climate data"""
-    df = pd.read_csv("data/bergen_climate_data.csv")
-    return process_data(df)
+    return _load_data(dataset_version())
 
-def setup_sidebar():
-    """Setup sidebar with filters and key statistics"""
-    df = load_data()
-    
-    # Sidebar for filters and controls
+@st.cache_data
+def _load_year_sketches(version):
+    return build_year_sketches(_load_data(version), SKETCH_COLUMNS)
+
+def load_year_sketches():
+    """Load per-year quantile sketches, built once per dataset version"""
+    return _load_year_sketches(dataset_version())
+
+@st.cache_data
+def _load_harmonic_design(version):
+    return harmonic_design_matrix(_load_data(version)['time'])
+
+def load_harmonic_design():
+    """Load the seasonal harmonic design matrix for every row of the full dataset"""
+    return _load_harmonic_design(dataset_version())
+
+@st.cache_data
+def _load_climate_indices(version):
+    df = _load_data(version)
+    return annual_indices(df), standardized_precipitation_index(df)
+
+def load_climate_indices():
+    """Load annual climate indices and the monthly SPI series, computed once per dataset version"""
+    return _load_climate_indices(dataset_version())
+
+def stations_version():
+    """Identify the current set of station files by name, modification time and size"""
+    return "|".join(f"{station}:{file_version(path)}" for station, path in discover_stations().items())
+
+@st.cache_data
+def _load_station_data(version):
+    frames = []
+    for station, path in discover_stations().items():
+        station_df = process_data(pd.read_csv(path))
+        station_df['station'] = station
+        frames.append(station_df)
+    return pd.concat(frames, ignore_index=True)
+
+def load_station_data():
+    """Load and process the daily data of every station"""
+    return _load_station_data(stations_version())
+
+@st.cache_data
+def _load_station(path, version):
+    return process_data(pd.read_csv(path))
+
+def load_station(station):
+    """Load and process the daily data of a single station"""
+    path = discover_stations()[station]
+    return _load_station(path, file_version(path))
+
+@st.cache_data
+def _load_station_cube(version):
+    return station_year_cube(_load_station_data(version))
+
+def load_station_cube():
+    """Load the (station x year) aggregate arrays, built once per station data version"""
+    return _load_station_cube(stations_version())
+
+@st.cache_resource(max_entries=8)
+def _load_live_aggregates(station, path, version):
+    # The archive is only summarised, so it is read here rather than kept in another cache
+    return LiveAggregates(process_data(pd.read_csv(path)), live_log_path(station))
+
+def load_live_aggregates(station=DATA_STATION):
+    """Load a station's running aggregates, brought up to date with its live observation log"""
+    path = discover_stations()[station]
+    live = _load_live_aggregates(station, path, file_version(path))
+    live.refresh()
+    return live
+
+def year_range_slider(first_year, last_year):
+    """Sidebar controls header and year range slider over the given years"""
     st.sidebar.header("Dashboard Controls")
     
-    # Year filter
-    year_range = st.sidebar.slider(
+    return st.sidebar.slider(
         "Select Year Range", 
-        min_value=int(df['year'].min()), 
-        max_value=int(df['year'].max()), 
-        value=(int(df['year'].min()), int(df['year'].max())),
+        min_value=first_year, 
+        max_value=last_year, 
+        value=(first_year, last_year),
         help="Filter data by year range"
     )
+
+def setup_sidebar():
+    """Setup sidebar with filters and key statistics"""
+    df = load_data()
+    live = load_live_aggregates()
+    
+    # Year filter over the archive; the pages chart and tabulate archive rows only
+    year_range = year_range_slider(int(df['year'].min()), int(df['year'].max()))
+    
+    # Remember popular ranges so the next startup can warm them
+    record_range_view(year_range)
     
     # Filter data based on selection
     filtered_df = df[(df['year'] >= year_range[0]) & (df['year'] <= year_range[1])]
+    if filtered_df.empty:
+        st.error("❌ No archive data for the selected years. Please adjust the year range filter.")
+        st.stop()
     
     # Key metrics in the sidebar
     st.sidebar.markdown("#### 📈 Key Stats")
     
-    # Compact metrics with smaller text
-    avg_temp = filtered_df['temperature_avg'].mean()
-    total_rain = filtered_df['precipitation_sum'].sum()
-    max_temp = filtered_df['temperature_2m_max'].max()
-    min_temp = filtered_df['temperature_2m_min'].min()
+    # Compact metrics with smaller text, merged from the running year aggregates
+    stats = live.range_stats(year_range)
     
     cols = st.sidebar.columns(2)
-    cols[0].metric("Avg Temp (°C)", f"{avg_temp:.1f}")
-    cols[1].metric("Total Rain (mm)", f"{total_rain:.0f}")
-    cols[0].metric("Max Temp (°C)", f"{max_temp:.1f}")
-    cols[1].metric("Min Temp (°C)", f"{min_temp:.1f}")
+    cols[0].metric("Avg Temp (°C)", f"{stats['avg_temp']:.1f}")
+    cols[1].metric("Total Rain (mm)", f"{stats['total_rain']:.0f}")
+    cols[0].metric("Max Temp (°C)", f"{stats['max_temp']:.1f}")
+    cols[1].metric("Min Temp (°C)", f"{stats['min_temp']:.1f}")
+    
+    # Current periods, updated as observations arrive
+    live_through = live.live_through()
+    if live_through is not None:
+        st.sidebar.markdown("#### 🛰️ Latest")
+        st.sidebar.caption(f"Live observations through {live_through:%Y-%m-%d}")
+        periods = live.current_periods()
+        cols = st.sidebar.columns(3)
+        for col, period in zip(cols, ['month', 'season', 'year']):
+            col.metric(periods[period]['label'], f"{periods[period]['avg_temp']:.1f}°C", f"{periods[period]['total_rain']:.0f} mm", delta_color="off")
 
     
     return filtered_df, year_range
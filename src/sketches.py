@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+
+DESCRIBE_INDEX = ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+
+
+def _segment_sums(values, offsets, counts):
+    """Sum contiguous runs of values, returning 0 for empty runs"""
+    if len(values) == 0:
+        return np.zeros(len(offsets))
+    sums = np.add.reduceat(values, np.minimum(offsets, len(values) - 1))
+    return np.where(counts > 0, sums, 0.0)
+
+
+def build_year_sketches(df, columns):
+    """Build mergeable per-year summaries (moments and sorted values) for each column"""
+    years = df['year'].to_numpy()
+    unique_years = np.unique(years)
+
+    sketches = {'years': unique_years, 'columns': {}}
+
+    for column in columns:
+        values = df[column].to_numpy(dtype=float)
+        valid = ~np.isnan(values)
+        col_years, col_values = years[valid], values[valid]
+
+        # Sort by year, then by value, so every year is one contiguous sorted run
+        order = np.lexsort((col_values, col_years))
+        col_years, col_values = col_years[order], col_values[order]
+
+        # Offsets of each year's run inside the flat value array
+        offsets = np.searchsorted(col_years, unique_years, side='left')
+        ends = np.searchsorted(col_years, unique_years, side='right')
+        counts = ends - offsets
+
+        # Per-year moments via segmented sums over the sorted runs
+        sums = _segment_sums(col_values, offsets, counts)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = np.where(counts > 0, sums / counts, np.nan)
+        deviations = col_values - np.repeat(np.nan_to_num(means), counts)
+        m2 = _segment_sums(deviations ** 2, offsets, counts)
+
+        # Sorted runs make the extremes the first and last element of each run
+        padded = np.append(col_values, np.nan)
+        mins = np.where(counts > 0, padded[offsets], np.nan)
+        maxs = np.where(counts > 0, padded[ends - 1], np.nan)
+
+        sketches['columns'][column] = {
+            'values': col_values,
+            'offsets': offsets,
+            'counts': counts,
+            'means': means,
+            'm2': m2,
+            'mins': mins,
+            'maxs': maxs,
+        }
+
+    return sketches
+
+
+def _year_slice(sketches, year_range):
+    """Return the index slice of the years that fall inside year_range"""
+    years = sketches['years']
+    start = np.searchsorted(years, year_range[0], side='left')
+    stop = np.searchsorted(years, year_range[1], side='right')
+    return slice(start, stop)
+
+
+def _merged_values(sketch, years):
+    """Merge the sorted per-year runs of a contiguous year slice into one sorted array"""
+    if years.start >= years.stop:
+        return np.empty(0)
+    start = sketch['offsets'][years.start]
+    stop = sketch['offsets'][years.stop - 1] + sketch['counts'][years.stop - 1]
+    # The runs are already sorted, so the stable (run-aware) sort only has to merge them
+    return np.sort(sketch['values'][start:stop], kind='stable')
+
+
+def _sorted_quantiles(sorted_values, quantiles):
+    """Linear-interpolation quantiles of an already sorted array (matches pandas/numpy)"""
+    quantiles = np.asarray(quantiles, dtype=float)
+    if len(sorted_values) == 0:
+        return np.full(quantiles.shape, np.nan)
+    position = quantiles * (len(sorted_values) - 1)
+    lower = np.floor(position).astype(int)
+    upper = np.minimum(lower + 1, len(sorted_values) - 1)
+    fraction = position - lower
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction
+
+
+def describe_range(sketches, columns, year_range):
+    """Equivalent of DataFrame.describe() for a year range, merged from per-year sketches"""
+    years = _year_slice(sketches, year_range)
+    summary = {}
+
+    for column in columns:
+        sketch = sketches['columns'][column]
+        counts = sketch['counts'][years]
+        total = counts.sum()
+
+        if total == 0:
+            summary[column] = [0] + [np.nan] * (len(DESCRIBE_INDEX) - 1)
+            continue
+
+        # Combine per-year means and squared deviations (parallel variance formula)
+        present = counts > 0
+        means = sketch['means'][years][present]
+        weights = counts[present]
+        mean = np.sum(weights * means) / total
+        m2 = np.sum(sketch['m2'][years][present]) + np.sum(weights * (means - mean) ** 2)
+        std = np.sqrt(m2 / (total - 1)) if total > 1 else np.nan
+
+        quartiles = _sorted_quantiles(_merged_values(sketch, years), [0.25, 0.5, 0.75])
+
+        summary[column] = [
+            total,
+            mean,
+            std,
+            np.min(sketch['mins'][years][present]),
+            *quartiles,
+            np.max(sketch['maxs'][years][present]),
+        ]
+
+    return pd.DataFrame(summary, index=DESCRIBE_INDEX, columns=list(columns)).astype(float)
@@ -0,0 +1,103 @@
+import glob
+import os
+import warnings
+import numpy as np
+import pandas as pd
+
+# Station files are named "<station>_climate_data.csv" in the data directory
+DATA_DIR = "data"
+STATION_FILE_SUFFIX = "_climate_data.csv"
+
+def discover_stations(data_dir=DATA_DIR):
+    """Map station names to their data files"""
+    paths = sorted(glob.glob(os.path.join(data_dir, f"*{STATION_FILE_SUFFIX}")))
+    return {os.path.basename(path)[:-len(STATION_FILE_SUFFIX)]: path for path in paths}
+
+def station_label(station):
+    """Human-readable station name"""
+    return station.replace('_', ' ').title()
+
+def station_year_cube(df):
+    """Aggregate daily rows of all stations into (station x year) arrays in one pass"""
+    station_codes, stations = pd.factorize(df['station'], sort=True)
+    years = df['year'].to_numpy()
+    first_year, last_year = years.min(), years.max()
+    n_stations, n_years = len(stations), last_year - first_year + 1
+
+    # Flat cell index of every daily row
+    cell = station_codes * n_years + (years - first_year)
+    size = n_stations * n_years
+
+    def cell_sum(values):
+        return np.bincount(cell, weights=values, minlength=size).reshape(n_stations, n_years)
+
+    def cell_extreme(ufunc, values, fill):
+        result = np.full(size, fill)
+        ufunc.at(result, cell, values)
+        result[np.isinf(result)] = np.nan
+        return result.reshape(n_stations, n_years)
+
+    temp_avg = df['temperature_avg'].to_numpy(dtype=float)
+    rain = df['precipitation_sum'].to_numpy(dtype=float)
+    days = cell_sum(np.ones(len(df)))
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        temp_mean = np.where(days > 0, cell_sum(temp_avg) / days, np.nan)
+
+    return {
+        'stations': np.asarray(stations),
+        'years': np.arange(first_year, last_year + 1),
+        'days': days,
+        'temp_mean': temp_mean,
+        'rain_total': np.where(days > 0, cell_sum(rain), np.nan),
+        'temp_max': cell_extreme(np.fmax, df['temperature_2m_max'].to_numpy(dtype=float), -np.inf),
+        'temp_min': cell_extreme(np.fmin, df['temperature_2m_min'].to_numpy(dtype=float), np.inf),
+        'rain_max': cell_extreme(np.fmax, rain, -np.inf),
+    }
+
+def _row_slopes(years, values):
+    """Least-squares slope of every row of values against years, ignoring NaNs"""
+    mask = ~np.isnan(values)
+    counts = mask.sum(axis=1)
+    x = np.where(mask, years, 0.0)
+    y = np.where(mask, values, 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        x_mean = x.sum(axis=1) / counts
+        y_mean = y.sum(axis=1) / counts
+        dx = np.where(mask, years - x_mean[:, None], 0.0)
+        dy = np.where(mask, values - y_mean[:, None], 0.0)
+        slopes = (dx * dy).sum(axis=1) / (dx ** 2).sum(axis=1)
+    return np.where(counts >= 2, slopes, np.nan)
+
+def compare_stations(cube, year_range):
+    """Rank every station by annual climate statistics over a year range"""
+    years = cube['years']
+    selected = (years >= year_range[0]) & (years <= year_range[1])
+    selected_years = years[selected].astype(float)
+
+    temp_mean = cube['temp_mean'][:, selected]
+    rain_total = cube['rain_total'][:, selected]
+
+    if not selected.any():
+        # Keep the reductions below well-defined for ranges without data
+        selected_years = np.array([float(year_range[0])])
+        temp_mean = rain_total = np.full((len(cube['stations']), 1), np.nan)
+        extremes = {key: np.full((len(cube['stations']), 1), np.nan) for key in ('temp_max', 'temp_min', 'rain_max')}
+    else:
+        extremes = {key: cube[key][:, selected] for key in ('temp_max', 'temp_min', 'rain_max')}
+
+    # Stations without data in the range produce all-NaN rows; leave them as NaN
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        comparison = pd.DataFrame({
+            'Avg Temp (°C)': np.nanmean(temp_mean, axis=1),
+            'Avg Annual Rain (mm)': np.nanmean(rain_total, axis=1),
+            'Total Rain (mm)': np.nansum(rain_total, axis=1),
+            'Temp Trend (°C/year)': _row_slopes(selected_years, temp_mean),
+            'Rain Trend (mm/year)': _row_slopes(selected_years, rain_total),
+            'Max Temp (°C)': np.nanmax(extremes['temp_max'], axis=1),
+            'Min Temp (°C)': np.nanmin(extremes['temp_min'], axis=1),
+            'Max Daily Rain (mm)': np.nanmax(extremes['rain_max'], axis=1),
+        }, index=pd.Index([station_label(s) for s in cube['stations']], name='Station'))
+
+    return comparison
@@ -0,0 +1,50 @@
+import numpy as np
+import streamlit as st
+
+PAGE_SIZES = [25, 50, 100, 250]
+
+def _filter_rows(df, search_term):
+    """Rows where any column contains search_term (case-insensitive)"""
+    if not search_term:
+        return df
+    mask = np.zeros(len(df), dtype=bool)
+    for column in df.columns:
+        mask |= df[column].astype(str).str.contains(search_term, case=False, na=False, regex=False).to_numpy()
+    return df[mask]
+
+def paginated_table(df, key, page_size=PAGE_SIZES[0], searchable=True, hide_index=True):
+    """Show a frame one page at a time, sorting and filtering on the server.
+
+    Only the visible slice of rows is sent to the browser. Returns the filtered
+    and sorted frame so callers can offer it as a download.
+    """
+    controls = st.columns([3, 2, 1, 1]) if searchable else [None] + list(st.columns([2, 1, 1]))
+
+    search_term = controls[0].text_input("🔍 Search", key=f"{key}_search") if searchable else ""
+    sort_column = controls[1].selectbox("Sort by", ["(original order)"] + list(df.columns), key=f"{key}_sort")
+    descending = controls[2].selectbox("Order", ["Ascending", "Descending"], key=f"{key}_order") == "Descending"
+    rows_per_page = controls[3].selectbox(
+        "Rows", PAGE_SIZES, index=PAGE_SIZES.index(page_size) if page_size in PAGE_SIZES else 0, key=f"{key}_rows"
+    )
+
+    view = _filter_rows(df, search_term)
+    if sort_column != "(original order)":
+        view = view.sort_values(sort_column, ascending=not descending, kind='stable')
+    elif descending:
+        view = view.iloc[::-1]
+
+    page_count = max(1, int(np.ceil(len(view) / rows_per_page)))
+
+    # A new filter can shrink the table below the remembered page
+    page_key = f"{key}_page"
+    if st.session_state.setdefault(page_key, 1) > page_count:
+        st.session_state[page_key] = page_count
+
+    page = st.number_input("Page", min_value=1, max_value=page_count, step=1, key=page_key)
+    start = (page - 1) * rows_per_page
+    stop = min(start + rows_per_page, len(view))
+
+    st.dataframe(view.iloc[start:stop], use_container_width=True, hide_index=hide_index)
+    st.caption(f"Rows {start + 1 if len(view) else 0}–{stop} of {len(view)} (page {page} of {page_count})")
+
+    return view
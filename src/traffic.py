@@ -0,0 +1,51 @@
+import json
+import os
+import threading
+import time
+from collections import Counter, deque
+
+# Recent year-range selections, persisted so the next deploy can warm the same views
+TRAFFIC_PATH = os.environ.get("CLIMATE_TRAFFIC_PATH", ".cache/range_traffic.json")
+MAX_RECENT_VIEWS = 500
+PERSIST_INTERVAL = 30  # seconds
+
+_lock = threading.Lock()
+_recent_views = deque(maxlen=MAX_RECENT_VIEWS)
+_last_persisted = 0.0
+
+def _load_recent_views():
+    """Read persisted views from an earlier run, if any"""
+    try:
+        with open(TRAFFIC_PATH) as f:
+            return [tuple(view) for view in json.load(f)]
+    except (OSError, ValueError):
+        return []
+
+_recent_views.extend(_load_recent_views())
+
+def _persist():
+    os.makedirs(os.path.dirname(TRAFFIC_PATH) or ".", exist_ok=True)
+    temporary_path = f"{TRAFFIC_PATH}.tmp"
+    with open(temporary_path, "w") as f:
+        json.dump([list(view) for view in _recent_views], f)
+    os.replace(temporary_path, TRAFFIC_PATH)
+
+def record_range_view(year_range):
+    """Remember that a page was viewed with this year range"""
+    global _last_persisted
+    with _lock:
+        _recent_views.append((int(year_range[0]), int(year_range[1])))
+        now = time.monotonic()
+        if now - _last_persisted >= PERSIST_INTERVAL:
+            _last_persisted = now
+            try:
+                _persist()
+            except OSError:
+                # Traffic stats are best-effort; never break a page over them
+                pass
+
+def common_ranges(limit=5):
+    """Most frequently viewed year ranges among the recent views"""
+    with _lock:
+        counts = Counter(_recent_views)
+    return [view for view, _ in counts.most_common(limit)]
@@ -0,0 +1,159 @@
+import os
+import numpy as np
+import pandas as pd
+
+MEASUREMENT_COLUMNS = ['temperature_2m_max', 'temperature_2m_min', 'precipitation_sum']
+
+# Plausible physical limits for daily values at our stations
+PHYSICAL_RANGES = {
+    'temperature_2m_max': (-50.0, 45.0),
+    'temperature_2m_min': (-60.0, 40.0),
+    'precipitation_sum': (0.0, 400.0),
+}
+
+# A one-day jump in mean temperature this large in both directions is treated as a spike (°C)
+SPIKE_THRESHOLD = 12.0
+
+QUARANTINE_DIR = "data/quarantine"
+
+def _rule_masks(df, existing_dates=None):
+    """Evaluate every row-level rule as a boolean column over the whole batch"""
+    times = pd.to_datetime(df['time'], errors='coerce', format='ISO8601')
+    stations = df['station'].to_numpy() if 'station' in df.columns else np.zeros(len(df))
+    masks = {'invalid_date': times.isna().to_numpy()}
+
+    values = {column: pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=float) for column in MEASUREMENT_COLUMNS}
+    masks['all_values_missing'] = np.all([np.isnan(v) for v in values.values()], axis=0)
+
+    for column, (low, high) in PHYSICAL_RANGES.items():
+        # NaN compares False, so missing values are not reported as out of range
+        masks[f'{column}_out_of_range'] = (values[column] < low) | (values[column] > high)
+
+    masks['min_above_max'] = values['temperature_2m_min'] > values['temperature_2m_max']
+
+    # Later copies of a (station, date) pair are duplicates of the first
+    keys = pd.DataFrame({'station': stations, 'time': times})
+    masks['duplicate_date'] = keys.duplicated(keep='first').to_numpy() & ~masks['invalid_date']
+
+    if existing_dates is not None:
+        # Compare calendar days so hourly rows of a stored day are caught as well
+        masks['already_present'] = times.dt.normalize().isin(pd.to_datetime(existing_dates)).to_numpy()
+
+    # Spikes: jumps away from both neighbours of the same station, in opposite directions
+    order = np.lexsort((times.to_numpy(), stations))
+    mean_temp = ((values['temperature_2m_max'] + values['temperature_2m_min']) / 2)[order]
+    same_station = stations[order][1:] == stations[order][:-1]
+    step = np.where(same_station, np.diff(mean_temp), np.nan)
+    from_previous = np.concatenate([[np.nan], step])
+    to_next = np.concatenate([step, [np.nan]])
+    spike_sorted = (np.abs(from_previous) > SPIKE_THRESHOLD) & (np.abs(to_next) > SPIKE_THRESHOLD) & (from_previous * to_next < 0)
+    masks['temperature_spike'] = np.empty(len(df), dtype=bool)
+    masks['temperature_spike'][order] = spike_sorted
+
+    return masks, times
+
+def _missing_dates(times, stations, last_existing_date=None):
+    """Calendar days absent between the first and last date of each station"""
+    valid = ~pd.isna(times)
+    days = times[valid].to_numpy().astype('datetime64[D]').astype(np.int64)
+    codes = pd.factorize(np.asarray(stations)[valid])[0]
+
+    if last_existing_date is not None:
+        # Gaps between the stored data and the batch count as missing too
+        last_day = np.datetime64(pd.Timestamp(last_existing_date), 'D').astype(np.int64)
+        present = np.unique(codes)
+        days = np.concatenate([days, np.full(len(present), last_day)])
+        codes = np.concatenate([codes, present])
+
+    order = np.lexsort((days, codes))
+    days, codes = days[order], codes[order]
+
+    # Gap lengths between consecutive days of the same station
+    gaps = np.where(codes[1:] == codes[:-1], np.diff(days) - 1, 0).clip(min=0)
+    starts = days[:-1][gaps > 0] + 1
+    lengths = gaps[gaps > 0]
+
+    # Expand every gap into its individual days
+    offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    missing = np.unique(np.repeat(starts, lengths) + offsets)
+    return pd.DatetimeIndex(missing.astype('datetime64[D]'))
+
+def missing_date_report(times, stations=None, existing_dates=None):
+    """Report entries for the calendar days absent from accepted rows and the stored dates"""
+    times = pd.Series(pd.to_datetime(times, format='ISO8601'))
+    stations = np.zeros(len(times)) if stations is None else np.asarray(stations)
+    last_existing_date = pd.to_datetime(existing_dates).max() if existing_dates is not None and len(existing_dates) else None
+    missing_dates = _missing_dates(times, stations, last_existing_date)
+    return {
+        'missing_dates': len(missing_dates),
+        'first_missing_dates': [date.strftime('%Y-%m-%d') for date in missing_dates[:10]],
+    }
+
+def validate_batch(df, existing_dates=None):
+    """Run every validation rule over an incoming batch of daily rows.
+
+    Returns (clean, quarantine, report): rows that passed, failing rows with a
+    'reason' column listing the rules they broke, and a summary report.
+    existing_dates, when given, are dates already stored in the dataset; they are
+    used to reject re-sent days and to find gaps between the dataset and the batch.
+    """
+    masks, times = _rule_masks(df, existing_dates)
+    failed = np.any(list(masks.values()), axis=0) if masks else np.zeros(len(df), dtype=bool)
+
+    quarantine = df[failed].copy()
+    reasons = pd.Series('', index=quarantine.index)
+    for rule, mask in masks.items():
+        reasons = reasons.str.cat(np.where(mask[failed], rule, ''), sep=';')
+    quarantine['reason'] = reasons.str.strip(';').str.replace(r';+', ';', regex=True)
+
+    clean = df[~failed]
+    stations = df['station'].to_numpy() if 'station' in df.columns else np.zeros(len(df))
+
+    report = {
+        'rows': len(df),
+        'accepted': len(clean),
+        'quarantined': int(failed.sum()),
+        'failures_by_rule': {rule: int(mask.sum()) for rule, mask in masks.items() if mask.any()},
+        'partially_missing_values': int(clean[MEASUREMENT_COLUMNS].isna().any(axis=1).sum()),
+        **missing_date_report(times[~failed], stations[~failed], existing_dates),
+    }
+    return clean, quarantine, report
+
+def write_quarantine(quarantine, station, quarantine_dir=QUARANTINE_DIR):
+    """Append quarantined rows to the station's quarantine store"""
+    if quarantine.empty:
+        return None
+    os.makedirs(quarantine_dir, exist_ok=True)
+    path = os.path.join(quarantine_dir, f"{station}_quarantine.csv")
+    stored = quarantine.assign(quarantined_at=pd.Timestamp.now().isoformat(timespec='seconds'))
+    if not os.path.exists(path):
+        stored.to_csv(path, index=False)
+        return path
+
+    # Writers differ in columns (live rows carry 'resolution'); align to the stored header
+    header = pd.read_csv(path, nrows=0).columns.tolist()
+    new_columns = [column for column in stored.columns if column not in header]
+    if new_columns:
+        # Rare: widen the store once so earlier rows keep their values
+        existing = pd.read_csv(path, dtype=str, keep_default_na=False)
+        pd.concat([existing, stored], ignore_index=True).reindex(
+            columns=header + new_columns
+        ).to_csv(path, index=False)
+    else:
+        stored.reindex(columns=header).to_csv(path, mode='a', header=False, index=False)
+    return path
+
+def format_report(report):
+    """Human-readable validation summary"""
+    lines = [
+        f"Rows received:     {report['rows']}",
+        f"Rows accepted:     {report['accepted']}",
+        f"Rows quarantined:  {report['quarantined']}",
+    ]
+    for rule, count in report['failures_by_rule'].items():
+        lines.append(f"  {rule}: {count}")
+    lines.append(f"Rows with some missing values: {report['partially_missing_values']}")
+    lines.append(f"Missing dates:     {report['missing_dates']}")
+    if report['first_missing_dates']:
+        lines.append(f"  first: {', '.join(report['first_missing_dates'])}")
+    return "\n".join(lines)
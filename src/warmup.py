@@ -0,0 +1,119 @@
+import os
+import threading
+import time
+import traceback
+
+from src.shared_utils import (
+    load_data, load_year_sketches, load_harmonic_design, load_climate_indices, load_station_cube,
+    load_live_aggregates
+)
+from src.plots import (
+    temperature_trends_figure, calendar_heatmap_figure, rainfall_figures, annual_average_figures, forecast_figure
+)
+from src.aggregates import yearly_series
+from src.traffic import common_ranges
+
+# Touched once warm-up succeeds, for health checks outside the process
+READY_FILE = os.environ.get("CLIMATE_READY_FILE", ".cache/ready")
+
+# Forecast controls as the Trend Analysis page first renders them
+DEFAULT_FORECAST_YEARS = 20
+DEFAULT_CONFIDENCE = 95
+
+class WarmupStatus:
+    """Progress of the background cache warm-up"""
+
+    def __init__(self):
+        self.ready = threading.Event()
+        self.started_at = None
+        self.finished_at = None
+        self.ranges = []
+        self.error = None
+
+    def as_dict(self):
+        return {
+            'started': self.started_at is not None,
+            'ready': self.ready.is_set(),
+            'ranges': [list(year_range) for year_range in self.ranges],
+            'seconds': round(self.finished_at - self.started_at, 2) if self.finished_at else None,
+            'error': self.error,
+        }
+
+STATUS = WarmupStatus()
+
+def warm_ranges(limit=5):
+    """The full year range followed by the most common recently viewed ranges"""
+    df = load_data()
+    full_range = (int(df['year'].min()), int(df['year'].max()))
+    ranges = [full_range]
+    for year_range in common_ranges(limit):
+        if year_range not in ranges and full_range[0] <= year_range[0] <= year_range[1] <= full_range[1]:
+            ranges.append(year_range)
+    return ranges
+
+def warm_range(df, year_range):
+    """Populate the figure and forecast caches the way the pages request them for one range"""
+    filtered_df = df[(df['year'] >= year_range[0]) & (df['year'] <= year_range[1])]
+
+    temperature_trends_figure(filtered_df)
+    calendar_heatmap_figure(filtered_df, "Temperature")
+    rainfall_figures(filtered_df)
+    annual_average_figures(filtered_df)
+
+    # Same yearly aggregation and call shape as the Trend Analysis page, so the forecast
+    # cache keys match; st.cache_data keys on the arguments actually passed
+    yearly = yearly_series(filtered_df)
+    if len(yearly) >= 2:
+        forecast_figure(yearly, DEFAULT_FORECAST_YEARS, DEFAULT_CONFIDENCE, None)
+
+def warm_caches(limit=5):
+    """Load the data and aggregate caches, then the per-range caches of the default views"""
+    STATUS.started_at = time.monotonic()
+    try:
+        df = load_data()
+        load_year_sketches()
+        load_harmonic_design()
+        load_climate_indices()
+        load_station_cube()
+        load_live_aggregates()
+
+        STATUS.ranges = warm_ranges(limit)
+        for year_range in STATUS.ranges:
+            warm_range(df, year_range)
+    except Exception:
+        # Pages still compute on demand, but health checks must not report ready
+        STATUS.error = traceback.format_exc(limit=3)
+    finally:
+        STATUS.finished_at = time.monotonic()
+
+    if STATUS.error is None:
+        STATUS.ready.set()
+        _touch_ready_file()
+
+def _touch_ready_file():
+    try:
+        os.makedirs(os.path.dirname(READY_FILE) or ".", exist_ok=True)
+        with open(READY_FILE, "w") as f:
+            f.write("ready\n")
+    except OSError:
+        pass
+
+def remove_ready_file():
+    """Drop a ready file left behind by a previous process"""
+    try:
+        os.remove(READY_FILE)
+    except OSError:
+        pass
+
+_warmup_lock = threading.Lock()
+_warmup_thread = None
+
+def start_warmup(limit=5):
+    """Start warming the caches in a background thread, once per process, without blocking the app"""
+    global _warmup_thread
+    with _warmup_lock:
+        if _warmup_thread is None:
+            remove_ready_file()
+            _warmup_thread = threading.Thread(target=warm_caches, args=(limit,), name="cache-warmup", daemon=True)
+            _warmup_thread.start()
+    return _warmup_thread
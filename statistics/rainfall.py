@@ -1,6 +1,9 @@
 import streamlit as st
 import pandas as pd
-from src.shared_utils import setup_sidebar
+from src.shared_utils import setup_sidebar, load_year_sketches
+from src.sketches import describe_range
+from src.tables import paginated_table
+from src.aggregates import monthly_rainfall
 from src.plots import plot_rainfall_trends
 
 st.title("🌧️ Rainfall Patterns")
@@ -29,13 +32,17 @@ col1, col2 = st.columns(2)
 
 with col1:
     st.markdown("#### Rainfall Statistics")
-    rain_stats = filtered_df['precipitation_sum'].describe().round(2)
+    rain_stats = describe_range(load_year_sketches(), ['precipitation_sum'], year_range)['precipitation_sum'].round(2)
     st.dataframe(rain_stats.to_frame('Precipitation (mm)'), use_container_width=True)
 
 with col2:
     st.markdown("#### Monthly Precipitation Totals")
-    monthly_rain = filtered_df.groupby(pd.to_datetime(filtered_df['time']).dt.to_period('M'))['precipitation_sum'].sum().round(1)
-    st.dataframe(monthly_rain.to_frame('Total (mm)'), use_container_width=True, height=300)
+    monthly_rain = monthly_rainfall(filtered_df)
+    paginated_table(
+        monthly_rain.to_frame('Total (mm)').reset_index().astype({'Month': str}),
+        key="monthly_rain",
+        searchable=False
+    )
 
 # Rainfall categories
 st.markdown("### 🌦️ Rainfall Categories")
@@ -92,19 +99,8 @@ if len(filtered_df) > 0:
 with st.expander("🔍 View Raw Precipitation Data"):
     st.markdown(f"Showing data for years {year_range[0]} - {year_range[1]}")
     
-    # Search functionality
-    search_term = st.text_input("🔍 Search in data (optional)")
-    display_df = filtered_df[['time', 'precipitation_sum']].copy()
-    
-    if search_term:
-        mask = display_df.astype(str).apply(lambda x: x.str.contains(search_term, case=False, na=False)).any(axis=1)
-        display_df = display_df[mask]
-    
-    st.dataframe(
-        display_df, 
-        use_container_width=True,
-        height=400
-    )
+    # Search, sort and paging happen server-side; only the visible rows are sent
+    display_df = paginated_table(filtered_df[['time', 'precipitation_sum']], key="raw_rain", page_size=50)
     
     # Download button
     csv = display_df.to_csv(index=False)
@@ -1,7 +1,9 @@
 import streamlit as st
-import pandas as pd
-from src.shared_utils import setup_sidebar
-from src.plots import plot_temperature_trends
+from src.shared_utils import setup_sidebar, load_year_sketches
+from src.sketches import describe_range
+from src.tables import paginated_table
+from src.aggregates import monthly_temperatures
+from src.plots import plot_temperature_trends, plot_calendar_heatmap
 
 st.title("🌡️ Temperature Trends")
 st.markdown("Detailed analysis of temperature patterns over time")
@@ -33,25 +35,38 @@ with col3:
     st.metric("Average Temperature", f"{avg_temp:.1f}°C")
     st.markdown('</div>', unsafe_allow_html=True)
 
+# Calendar overview
+st.markdown("### 🗓️ Calendar View")
+calendar_metric = st.selectbox(
+    "Calendar metric",
+    ["Temperature", "Anomaly", "Precipitation"],
+    help="Every day of the selected years, one row per year"
+)
+plot_calendar_heatmap(filtered_df, calendar_metric)
+
 # Additional analysis
 st.markdown("### 📊 Temperature Analysis")
 
-# Monthly averages - convert datetime to string for grouping
-monthly_temps = filtered_df.groupby(pd.to_datetime(filtered_df['time']).dt.to_period('M')).agg({
-    'temperature_2m_max': 'mean',
-    'temperature_2m_min': 'mean',
-    'temperature_avg': 'mean'
-}).round(1)
+# Monthly averages, shared with the static snapshot export
+monthly_temps = monthly_temperatures(filtered_df)
 
 col1, col2 = st.columns(2)
 
 with col1:
     st.markdown("#### Monthly Temperature Averages")
-    st.dataframe(monthly_temps, use_container_width=True)
+    paginated_table(
+        monthly_temps.reset_index().astype({'Month': str}),
+        key="monthly_temps",
+        searchable=False
+    )
 
 with col2:
     st.markdown("#### Temperature Statistics")
-    temp_stats = filtered_df[['temperature_2m_max', 'temperature_2m_min', 'temperature_avg']].describe().round(1)
+    temp_stats = describe_range(
+        load_year_sketches(),
+        ['temperature_2m_max', 'temperature_2m_min', 'temperature_avg'],
+        year_range
+    ).round(1)
     st.dataframe(temp_stats, use_container_width=True)
 
 # Seasonal analysis